@@ -0,0 +1,307 @@
+"""
+Benchmark de los operadores más usados de Jewelry Tools.
+
+Se ejecuta sin interfaz, con Blender o con el módulo ``bpy``:
+
+    blender -b --factory-startup -P benchmark_jewelry.py -- --sizes 100 1000 --out bench.json
+    python benchmark_jewelry.py --sizes 100 1000 10000 --compare bench_anterior.json
+
+Para cada tamaño construye una escena sintética (una malla objetivo subdividida
+con N gemas Round y N Prongs/Cutter), cronometra los operadores y escribe un
+reporte JSON que se puede comparar entre versiones.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import bpy
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import jewelry_tools  # noqa: E402
+from jewelry_tools import diamant_jewelry, export_stl, gem_distribution, jewelry_cache  # noqa: E402
+
+# Módulos cuyo arranque en frío se mide
+ADDONS = (diamant_jewelry, gem_distribution, export_stl)
+
+# Separación aproximada entre gemas en la escena sintética (mm)
+PITCH = 1.3
+
+
+# ------------------------------
+# Escena sintética
+# ------------------------------
+
+def build_scene(count, seed=0, export_dir=None):
+    """Escena vacía con una malla objetivo subdividida y `count` piezas por familia."""
+    bpy.ops.wm.read_homefile(use_empty=True)
+    scene = bpy.context.scene
+    coll = scene.collection
+    rng = random.Random(seed)
+
+    side = max(int(count ** 0.5) + 1, 2)
+    size = side * PITCH + 2.0
+
+    # Malla objetivo: rejilla subdividida con algo de relieve
+    bpy.ops.mesh.primitive_grid_add(x_subdivisions=side * 4, y_subdivisions=side * 4, size=size)
+    target = bpy.context.active_object
+    target.name = "Target"
+    for v in target.data.vertices:
+        v.co.z = 0.2 * rng.random()
+    target.data.update()
+
+    # Mallas compartidas por todas las piezas de cada familia
+    temps = []
+    bpy.ops.mesh.primitive_cone_add(vertices=16, radius1=0.5, radius2=0.0, depth=0.6)
+    temps.append(bpy.context.active_object)
+    bpy.ops.mesh.primitive_cylinder_add(vertices=8, radius=0.1, depth=1.0)
+    temps.append(bpy.context.active_object)
+    bpy.ops.mesh.primitive_cylinder_add(vertices=16, radius=0.55, depth=1.5)
+    temps.append(bpy.context.active_object)
+    gem_mesh, prong_mesh, cutter_mesh = (o.data for o in temps)
+    bpy.data.batch_remove(temps)  # las mallas se quedan, los objetos temporales no
+
+    half = side * PITCH / 2
+    families = {"Round": gem_mesh, "Prongs": prong_mesh, "Cutter": cutter_mesh}
+    objs = {name: [] for name in families}
+    for i in range(count):
+        x = (i % side) * PITCH - half + rng.uniform(-0.2, 0.2)
+        y = (i // side) * PITCH - half + rng.uniform(-0.2, 0.2)
+        for name, mesh in families.items():
+            obj = bpy.data.objects.new(name, mesh)
+            obj.location = (x, y, 1.0)
+            coll.objects.link(obj)
+            objs[name].append(obj)
+
+    # Grupo numérico para la exportación
+    for i in range(3):
+        obj = bpy.data.objects.new(f"{i + 1}-Shank", target.data)
+        coll.objects.link(obj)
+
+    scene.snapz_props.target = target
+    if export_dir:
+        scene.export_stl_props.export_path = export_dir
+    return target, objs
+
+
+def _override(objs, active):
+    """Contexto con la selección indicada (sin depender de una ventana)."""
+    for obj in bpy.context.view_layer.objects:
+        obj.select_set(False)
+    for obj in objs:
+        obj.select_set(True)
+    bpy.context.view_layer.objects.active = active
+    return bpy.context.temp_override(
+        selected_objects=list(objs),
+        selected_editable_objects=list(objs),
+        active_object=active,
+        object=active,
+    )
+
+
+# ------------------------------
+# Casos
+# ------------------------------
+
+def case_snap_in_z(target, objs):
+    gems = objs["Round"]
+    with _override(gems, gems[0]):
+        bpy.ops.object.snap_in_z()
+
+
+def case_reacomodar(target, objs):
+    gems = objs["Round"]
+    with _override(gems, gems[0]):
+        bpy.ops.object.reacomodar_gemas()
+
+
+def case_distribuir_panal(target, objs):
+    gems = objs["Round"]
+    with _override(gems, gems[0]):
+        bpy.ops.object.distribuir_gemas_panal_centro()
+
+
+def case_select_all(target, objs):
+    with _override([], None):
+        bpy.ops.object.select_all_jewelry()
+
+
+def case_select_round(target, objs):
+    with _override([], None):
+        bpy.ops.object.select_round()
+
+
+def case_export(target, objs):
+    with _override([], None):
+        bpy.ops.exportstl.export()
+
+
+# (nombre, función)
+CASES = (
+    ("OBJECT_OT_snap_in_z", case_snap_in_z),
+    ("OBJECT_OT_reacomodar_gemas", case_reacomodar),
+    ("OBJECT_OT_distribuir_gemas_panal_centro", case_distribuir_panal),
+    ("OBJECT_OT_select_all_jewelry", case_select_all),
+    ("OBJECT_OT_select_round", case_select_round),
+    ("EXPORTSTL_OT_export", case_export),
+)
+
+
+def run_case(func, count, repeat, seed, export_dir):
+    """Cronometra `func` sobre una escena nueva por repetición."""
+    times = []
+    for r in range(repeat):
+        target, objs = build_scene(count, seed + r, export_dir)
+        start = time.perf_counter()
+        func(target, objs)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+# Código que corre en un proceso nuevo: import en frío + register() de un add-on
+_STARTUP_SCRIPT = """
+import json, sys, time
+sys.path.insert(0, {path!r})
+numpy_before = "numpy" in sys.modules
+start = time.perf_counter()
+import {module} as addon
+imported = time.perf_counter()
+addon.register()
+registered = time.perf_counter()
+print("JT_STARTUP " + json.dumps({{
+    "import_ms": (imported - start) * 1000.0,
+    "register_ms": (registered - imported) * 1000.0,
+    "numpy_before": numpy_before,
+    "numpy_after": "numpy" in sys.modules,
+}}))
+"""
+
+
+def _startup_once(module):
+    code = _STARTUP_SCRIPT.format(path=os.path.dirname(os.path.abspath(__file__)), module=module)
+    if bpy.app.binary_path:
+        cmd = [bpy.app.binary_path, "-b", "--factory-startup", "--python-expr", code]
+    else:  # módulo bpy dentro de un Python normal
+        cmd = [sys.executable, "-c", code]
+    out = subprocess.run(cmd, capture_output=True, text=True, check=True).stdout
+    line = next(l for l in out.splitlines() if l.startswith("JT_STARTUP "))
+    return json.loads(line[len("JT_STARTUP "):])
+
+
+def measure_startup(repeat):
+    """
+    Arranque en frío de cada add-on, en un proceso nuevo por medición: tiempo
+    del primer `import` (ahí se nota si se carga NumPy) y de register(), en ms
+    (mediana). `numpy_after` dice si el add-on dejó NumPy cargado; si ya venía
+    cargado antes (`numpy_before`) el import no incluye ese costo.
+    """
+    startup = {}
+    for addon in ADDONS:
+        runs = [_startup_once(addon.__name__) for _ in range(repeat)]
+        entry = {
+            key: statistics.median(r[key] for r in runs)
+            for key in ("import_ms", "register_ms")
+        }
+        entry["numpy_before"] = any(r["numpy_before"] for r in runs)
+        entry["numpy_after"] = any(r["numpy_after"] for r in runs)
+        startup[addon.__name__] = entry
+        print(f"{addon.__name__:45} import {entry['import_ms']:>8.2f} ms  register {entry['register_ms']:>8.2f} ms"
+              f"  numpy {'sí' if entry['numpy_after'] else 'no'}")
+    return startup
+
+
+# ------------------------------
+# Reporte
+# ------------------------------
+
+def compare(results, baseline_path):
+    """Imprime la relación tiempo actual / tiempo de referencia por caso."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    ref = {(r["operator"], r["gems"]): r for r in baseline["results"] if r["status"] == "ok"}
+    print(f"\n{'operador':45} {'gemas':>7} {'antes':>10} {'ahora':>10} {'ratio':>7}")
+    for r in results:
+        old = ref.get((r["operator"], r["gems"]))
+        if r["status"] != "ok" or old is None:
+            continue
+        ratio = r["median_s"] / old["median_s"] if old["median_s"] else float("inf")
+        print(f"{r['operator']:45} {r['gems']:>7} {old['median_s']:>10.4f} {r['median_s']:>10.4f} {ratio:>7.2f}")
+
+
+def parse_args():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    parser = argparse.ArgumentParser(description="Benchmark de Jewelry Tools")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", nargs="+", default=None, help="Nombres de operador a medir")
+    parser.add_argument("--out", default="bench_jewelry.json")
+    parser.add_argument("--compare", default=None, help="Reporte JSON de referencia")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    jewelry_tools.register()
+
+    export_dir = tempfile.mkdtemp(prefix="jt_bench_")
+    results = []
+    startup = {}
+    try:
+        startup = measure_startup(args.repeat)
+        for count in args.sizes:
+            for name, func in CASES:
+                if args.only and name not in args.only:
+                    continue
+                entry = {"operator": name, "gems": count, "repeat": args.repeat}
+                before = jewelry_cache.stats()
+                try:
+                    times = run_case(func, count, args.repeat, args.seed, export_dir)
+                except Exception as exc:
+                    entry["status"] = "error"
+                    entry["error"] = repr(exc)
+                else:
+                    entry.update(
+                        status="ok",
+                        min_s=min(times),
+                        median_s=statistics.median(times),
+                        times_s=times,
+                    )
+                # Cada escena nueva vacía la cache: esto es lo que el caso reutilizó
+                after = jewelry_cache.stats()
+                entry["cache"] = {key: after[key] - before[key] for key in ("hits", "misses", "evictions")}
+                results.append(entry)
+                print(f"{name:45} {count:>7} {entry['status']:>8} {entry.get('median_s', 0.0):>10.4f} s")
+    finally:
+        try:
+            jewelry_tools.unregister()
+        except Exception:
+            pass
+
+    report = {
+        "blender": bpy.app.version_string,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "startup_ms": startup,
+        "cache": jewelry_cache.stats(),
+        "results": results,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Reporte escrito en {args.out}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+bl_info = {
+    "name": "Jewelry Tools",
+    "author": "Oscar Fernando",
+    "version": (2, 0, 0),
+    "blender": (3, 6, 0),
+    "location": "View3D > N Panel > Jewelry Tools / Joyería / Export STL",
+    "description": "Herramientas para creación de joyerías: gemas, prongs, asientos, peso, distribución de gemas y exportación STL",
+    "category": "Object",
+}
+
+# Este archivo no importa bpy: los procesos del modo paralelo de
+# jewelry_relax importan el paquete fuera de Blender.
+
+import importlib
+import sys
+
+# Módulos con register()/unregister(), en orden de registro
+_MODULES = ("jewelry_profiler", "diamant_jewelry", "gem_distribution", "export_stl")
+
+# Al recargar los scripts (F8) se recargan también los submódulos ya importados
+if "_loaded" in globals():
+    for _name in ("jewelry_cache", "jewelry_relax") + _MODULES:
+        _module = sys.modules.get(f"{__name__}.{_name}")
+        if _module is not None:
+            importlib.reload(_module)
+_loaded = True
+
+
+def _modules():
+    return [importlib.import_module(f"{__name__}.{name}") for name in _MODULES]
+
+
+def register():
+    for module in _modules():
+        module.register()
+
+
+def unregister():
+    for module in reversed(_modules()):
+        module.unregister()
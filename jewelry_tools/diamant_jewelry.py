@@ -0,0 +1,2488 @@
+import time
+
+_import_start = time.perf_counter()
+
+import importlib
+
+import bpy
+import mathutils
+from bpy_extras.io_utils import ExportHelper, ImportHelper
+from bpy.props import (
+    BoolProperty,
+    FloatProperty,
+    EnumProperty,
+    IntProperty,
+    PointerProperty,
+    StringProperty,
+)
+from mathutils import Matrix, Vector
+from mathutils.geometry import interpolate_bezier
+
+from . import jewelry_cache as mesh_cache
+from .jewelry_profiler import count as profile_count, phase as profile_phase
+
+
+class _LazyImport:
+    """Importa el módulo la primera vez que se usa (el add-on arranca sin cargar NumPy)."""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
+np = _LazyImport("numpy")
+gpu = _LazyImport("gpu")
+gpu_batch = _LazyImport("gpu_extras.batch")
+relax = _LazyImport(f"{__package__}.jewelry_relax")
+
+
+# ------------------------------
+# Utilidades
+# ------------------------------
+
+def get_dir_world(obj, mode: str) -> Vector:
+    """Devuelve la dirección de proyección en espacio mundo."""
+    if mode == 'GLOBAL_Z_DOWN':
+        return Vector((0, 0, -1))
+    elif mode == 'LOCAL_Z_NEG':
+        # -Z local del objeto (mover como presionar Z con orientación local)
+        return -(obj.matrix_world.to_3x3() @ Vector((0, 0, 1))).normalized()
+    else:
+        return Vector((0, 0, -1))
+
+def object_cast(eval_target_obj):
+    """
+    Función de rayo para snap_object sobre el objeto evaluado: convierte el
+    rayo a espacio local del objetivo (requerido por Blender 3.6) y usa su
+    ray_cast, cuyo BVH mantiene Blender mientras la malla evaluada no cambie.
+    """
+    mat = eval_target_obj.matrix_world
+    imat = mat.inverted()
+    nmat = mat.to_3x3()
+
+    def cast(start, direction):
+        start_local = imat @ start
+        dir_local = (imat @ (start + direction) - start_local).normalized()
+        with profile_phase("ray_cast"):
+            success, loc_local, nrm_local, _index = eval_target_obj.ray_cast(start_local, dir_local)
+        profile_count("rayos")
+        if not success:
+            return False, None, None
+        return True, mat @ loc_local, (nmat @ nrm_local).normalized()
+    return cast
+
+
+# ------------------------------
+# Tabla de longitud de arco (curvas)
+# ------------------------------
+
+# Subdivisiones por segmento Bezier al muestrear la curva
+CURVE_LUT_SUBDIV = 64
+
+# Cache de tablas por curva: nombre -> (huella, tabla)
+_curve_lut_cache = {}
+
+
+def _foreach_array(collection, attr, size):
+    """Lee un atributo de toda la colección de una vez con foreach_get."""
+    arr = np.empty(len(collection) * size, dtype=np.float32)
+    collection.foreach_get(attr, arr)
+    return arr
+
+
+def _curve_digest(curve_obj):
+    """Huella barata de los puntos de control y la matriz de la curva."""
+    parts = [np.array(curve_obj.matrix_world, dtype=np.float32).tobytes()]
+    for spline in curve_obj.data.splines:
+        parts.append((spline.type, spline.use_cyclic_u, spline.resolution_u))
+        if spline.type == 'BEZIER':
+            for attr in ("co", "handle_left", "handle_right"):
+                parts.append(_foreach_array(spline.bezier_points, attr, 3).tobytes())
+        else:
+            parts.append(_foreach_array(spline.points, "co", 4).tobytes())
+    return hash(tuple(parts))
+
+
+def _sample_spline(spline):
+    """Devuelve los puntos (espacio local) de la spline en orden y si es cíclica."""
+    cyclic = spline.use_cyclic_u
+    if spline.type == 'BEZIER':
+        bp = spline.bezier_points
+        n = len(bp)
+        pts = []
+        for i in range(n if cyclic else n - 1):
+            a, b = bp[i], bp[(i + 1) % n]
+            seg = interpolate_bezier(a.co, a.handle_right, b.handle_left, b.co, CURVE_LUT_SUBDIV + 1)
+            pts.extend(p[:] for p in seg[:-1])
+        pts.append(bp[0].co[:] if cyclic else bp[-1].co[:])
+        coords = np.array(pts, dtype=np.float64)
+    else:
+        # POLY / NURBS: se usa el polígono de control
+        coords = _foreach_array(spline.points, "co", 4).reshape(-1, 4)[:, :3].astype(np.float64)
+        if cyclic:
+            coords = np.vstack((coords, coords[:1]))
+    return coords, cyclic
+
+
+def _normalize_rows(v):
+    n = np.linalg.norm(v, axis=1, keepdims=True)
+    n[n < 1e-12] = 1.0
+    return v / n
+
+
+def build_curve_lut(curve_obj):
+    """
+    Evalúa la primera spline de la curva una sola vez y devuelve una tabla
+    parametrizada por longitud de arco: puntos, tangentes y normales (mundo).
+    """
+    coords, cyclic = _sample_spline(curve_obj.data.splines[0])
+    mat = np.array(curve_obj.matrix_world, dtype=np.float64)
+    pts = coords @ mat[:3, :3].T + mat[:3, 3]
+
+    # Quitar muestras repetidas (segmentos de longitud cero)
+    seg = np.linalg.norm(np.diff(pts, axis=0), axis=1)
+    keep = np.concatenate(([True], seg > 1e-9))
+    pts = pts[keep]
+    lengths = np.concatenate(([0.0], np.cumsum(seg[seg > 1e-9])))
+    if len(pts) < 2:
+        return None
+
+    tangents = np.gradient(pts, lengths, axis=0)
+    if cyclic:
+        tangents[0] = tangents[-1] = pts[1] - pts[-2]
+    tangents = _normalize_rows(tangents)
+
+    # Normal del plano de la curva (menor componente principal)
+    centroid = pts.mean(axis=0)
+    plane_n = np.linalg.svd(pts - centroid, full_matrices=False)[2][2]
+    if plane_n[2] < 0:
+        plane_n = -plane_n
+
+    # Radial: en el plano, perpendicular a la tangente, hacia fuera
+    radial = _normalize_rows(np.cross(tangents, plane_n))
+    if np.einsum("ij,ij->", radial, pts - centroid) < 0:
+        radial = -radial
+
+    # Plano: normal del plano ortogonalizada respecto a la tangente
+    planar = plane_n - tangents * (tangents @ plane_n)[:, None]
+    planar = _normalize_rows(planar)
+
+    return {
+        "points": pts,
+        "tangents": tangents,
+        "normals": {'RADIAL': radial, 'PLANE': planar},
+        "lengths": lengths,
+        "cyclic": cyclic,
+    }
+
+
+def get_curve_lut(curve_obj):
+    """Tabla de la curva desde la cache; solo se reconstruye si cambió la curva."""
+    digest = _curve_digest(curve_obj)
+    cached = _curve_lut_cache.get(curve_obj.name)
+    if cached and cached[0] == digest:
+        return cached[1]
+    lut = build_curve_lut(curve_obj)
+    _curve_lut_cache[curve_obj.name] = (digest, lut)
+    return lut
+
+
+def curve_lut_lookup(lut, distances, orientation='RADIAL'):
+    """Busca (búsqueda binaria) posiciones, tangentes y normales a las distancias dadas."""
+    lengths = lut["lengths"]
+    pts = lut["points"]
+    tans = lut["tangents"]
+    nrms = lut["normals"][orientation]
+
+    d = np.clip(distances, 0.0, lengths[-1])
+    idx = np.clip(np.searchsorted(lengths, d, side='right') - 1, 0, len(lengths) - 2)
+    t = ((d - lengths[idx]) / (lengths[idx + 1] - lengths[idx]))[:, None]
+
+    pos = pts[idx] * (1.0 - t) + pts[idx + 1] * t
+    tan = _normalize_rows(tans[idx] * (1.0 - t) + tans[idx + 1] * t)
+    nrm = nrms[idx] * (1.0 - t) + nrms[idx + 1] * t
+    nrm = _normalize_rows(nrm - tan * np.einsum("ij,ij->i", nrm, tan)[:, None])
+    return pos, tan, nrm
+
+
+def euler_xyz_to_matrices(eul):
+    """Matrices de rotación (N, 3, 3) a partir de ángulos Euler XYZ (N, 3)."""
+    cx, cy, cz = np.cos(eul).T
+    sx, sy, sz = np.sin(eul).T
+    rot = np.empty((len(eul), 3, 3))
+    rot[:, 0, 0] = cy * cz
+    rot[:, 0, 1] = sx * sy * cz - cx * sz
+    rot[:, 0, 2] = cx * sy * cz + sx * sz
+    rot[:, 1, 0] = cy * sz
+    rot[:, 1, 1] = sx * sy * sz + cx * cz
+    rot[:, 1, 2] = cx * sy * sz - sx * cz
+    rot[:, 2, 0] = -sy
+    rot[:, 2, 1] = sx * cy
+    rot[:, 2, 2] = cx * cy
+    return rot
+
+
+def compose_matrices(pos, rot, scl):
+    """Matrices 4x4 (N, 4, 4) a partir de posición, Euler XYZ y escala."""
+    mats = np.zeros((len(pos), 4, 4))
+    mats[:, :3, :3] = euler_xyz_to_matrices(rot) * scl[:, None, :]
+    mats[:, :3, 3] = pos
+    mats[:, 3, 3] = 1.0
+    return mats
+
+
+def frames_to_matrices(pos, tan, nrm, scales):
+    """Matrices 4x4 con Y = tangente, Z = normal y la escala de cada objeto."""
+    count = len(pos)
+    mats = np.zeros((count, 4, 4))
+    mats[:, :3, 0] = np.cross(tan, nrm) * scales[:, 0:1]
+    mats[:, :3, 1] = tan * scales[:, 1:2]
+    mats[:, :3, 2] = nrm * scales[:, 2:3]
+    mats[:, :3, 3] = pos
+    mats[:, 3, 3] = 1.0
+    return mats
+
+
+
+#FaceProject
+def update_face_project(self, context):
+    tool_settings = context.scene.tool_settings
+    if context.scene.face_project_enabled:
+        # --- Activar Face Project ---
+        tool_settings.use_snap = True
+        tool_settings.snap_elements = {'FACE'}
+        tool_settings.use_snap_project = True
+        tool_settings.snap_target = 'MEDIAN'
+        tool_settings.use_snap_align_rotation = True
+    else:
+        # --- Desactivar y volver a Vertex Closest ---
+        tool_settings.use_snap = False
+        tool_settings.snap_elements = {'VERTEX'}
+        tool_settings.use_snap_project = False
+        tool_settings.snap_target = 'CLOSEST'
+        tool_settings.use_snap_align_rotation = False
+
+
+# ------------------------------
+# Propiedades
+# ------------------------------
+
+class SNAPZ_Props(bpy.types.PropertyGroup):
+    target: PointerProperty(
+        name="Malla objetivo",
+        type=bpy.types.Object,
+        description="Malla sobre la que se pegarán los objetos (si está vacío, se usa el activo)",
+    )
+    direction: EnumProperty(
+        name="Dirección",
+        description="Dirección a lo largo de la que se proyecta",
+        items=[
+            ('LOCAL_Z_NEG', "Z local (−Z)", "Proyectar a lo largo de la Z local del objeto"),
+            ('GLOBAL_Z_DOWN', "Z global (−Z)", "Proyectar a lo largo de la Z global"),
+        ],
+        default='LOCAL_Z_NEG',
+    )
+    align_rotation: BoolProperty(
+        name="Alinear rotación a la normal",
+        description="Hace que el eje Z del objeto apunte a la normal donde cae (similar a Align Rotation to Target)",
+        default=True,
+    )
+    offset: FloatProperty(
+        name="Offset",
+        description="Separación a lo largo de la normal (positivo despega un poco)",
+        default=0.0,
+        min=-1000.0, max=1000.0,
+        step=0.1, precision=4,
+    )
+    backtrack: FloatProperty(
+        name="Retroceso de inicio",
+        description="Cuánto retroceder desde el origen del objeto en dirección CONTRARIA antes de lanzar el rayo (para asegurar cruce)",
+        default=0.1,
+        min=0.0, max=1000.0,
+        step=0.1, precision=3,
+    )
+    max_step: FloatProperty(
+        name="Paso de rayo",
+        description="Magnitud del vector de rayo (no es distancia real, pero ayuda a la estabilidad del cálculo)",
+        default=10000.0,
+        min=0.01, max=1e9,
+    )
+    live_link: BoolProperty(
+        name="Enlace en vivo",
+        description="Vuelve a pegar las gemas pegadas a la malla objetivo cuando ésta cambia",
+        default=False,
+        update=lambda self, context: live_link_toggled(self, context),
+    )
+    live_delay: FloatProperty(
+        name="Retardo",
+        description="Segundos sin cambios en el objetivo antes de volver a pegar",
+        default=0.3,
+        min=0.0, max=5.0,
+        subtype='TIME', unit='TIME',
+    )
+
+# ------------------------------
+# Operador
+# ------------------------------
+
+def snap_object(obj, props, cast):
+    """
+    Proyecta `obj` sobre la superficie según las opciones de SNAPZ_Props.
+    `cast(start, direction)` devuelve (success, hit_world, normal_world).
+    """
+    dir_world = get_dir_world(obj, props.direction)
+    if dir_world.length == 0.0:
+        return False
+
+    # Punto de inicio: un poco "detrás" del objeto (contrario a la dirección), para garantizar cruce
+    start_world = obj.location - dir_world.normalized() * props.backtrack
+
+    # Usamos un vector largo para que el rayo recorra "bastante".
+    success, hit_world, normal_world = cast(start_world, dir_world.normalized() * props.max_step)
+
+    if not success:
+        # Si no pega, intenta en sentido contrario (por seguridad)
+        success, hit_world, normal_world = cast(start_world, (-dir_world).normalized() * props.max_step)
+
+    if not success:
+        return False
+
+    with profile_phase("escritura"):
+        # Nueva ubicación (con offset sobre la normal si se desea)
+        obj.location = hit_world + normal_world * props.offset
+
+        if props.align_rotation:
+            # Alinear Z del objeto a la normal del impacto (similar a Align Rotation to Target)
+            quat = normal_world.to_track_quat('Z', 'Y')
+            obj.rotation_euler = quat.to_euler(obj.rotation_mode)
+    return True
+
+
+class OBJECT_OT_snap_in_z(bpy.types.Operator):
+    bl_idname = "object.snap_in_z"
+    bl_label = "Pegar en Z"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        scn = context.scene
+        props = scn.snapz_props
+
+        # Determinar objetivo
+        target = props.target if props.target else context.active_object
+        if not target or target.type != 'MESH':
+            self.report({'ERROR'}, "Debes tener una malla objetivo (activa o seleccionada en el panel).")
+            return {'CANCELLED'}
+
+        # Objetos a pegar (excluye la malla objetivo)
+        sel_objs = [o for o in context.selected_objects if o != target]
+
+        if not sel_objs:
+            self.report({'WARNING'}, "No hay objetos seleccionados (aparte del objetivo).")
+            return {'CANCELLED'}
+
+        # Rayos contra el objetivo evaluado (Blender reutiliza su BVH mientras no cambie)
+        with profile_phase("depsgraph"):
+            cast = object_cast(target.evaluated_get(context.evaluated_depsgraph_get()))
+
+        moved = 0
+        for obj in sel_objs:
+            if snap_object(obj, props, cast):
+                obj[LIVE_SNAP_KEY] = target.name
+                moved += 1
+
+        profile_count("objetos_escritos", moved)
+
+        if moved == 0:
+            self.report({'WARNING'}, "No se encontró intersección para los objetos seleccionados. Revisa dirección u objetivo.")
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, f"Pegados {moved} objeto(s) a '{target.name}'.")
+        return {'FINISHED'}
+
+# ------------------------------
+# Pegado en vivo
+# ------------------------------
+
+# snap_in_z guarda en cada objeto pegado el nombre de su malla objetivo
+LIVE_SNAP_KEY = "jt_snap_target"
+
+# Estado del repegado diferido (la malla del objetivo la sigue la cache compartida)
+_live_state = {
+    "last_change": 0.0,
+    "pending": False,
+}
+
+
+def _changed_region(old_co, old_tris, co, tris, eps=1e-6):
+    """
+    Caja (min, max) que cubre los triángulos que se movieron, antes y después.
+    Devuelve None si cambió la topología (hay que repegar todo) y () si no cambió nada.
+    """
+    if old_co is None or old_co.shape != co.shape or not np.array_equal(old_tris, tris):
+        return None
+    moved = np.abs(co - old_co).max(axis=1) > eps
+    if not moved.any():
+        return ()
+    touched = tris[moved[tris].any(axis=1)]
+    if not len(touched):
+        return ()
+    pts = np.concatenate((co[touched].reshape(-1, 3), old_co[touched].reshape(-1, 3)))
+    return pts.min(axis=0), pts.max(axis=0)
+
+
+def _gems_in_region(gems, region, margin):
+    """Filtra las gemas cuya huella (esfera de la caja del objeto + margen) toca la región."""
+    if not gems:
+        return gems
+    centers = np.array([o.matrix_world.translation for o in gems], dtype=np.float64)
+    radii = np.array([max(o.dimensions) for o in gems], dtype=np.float64)[:, None] * 0.5 + margin
+    lo, hi = region
+    inside = np.all((centers + radii >= lo) & (centers - radii <= hi), axis=1)
+    return [o for o, hit in zip(gems, inside) if hit]
+
+
+def live_snap(scene, target, depsgraph):
+    """Repega sólo las gemas enlazadas a `target` que caen sobre la zona que cambió."""
+    props = scene.snapz_props
+    with profile_phase("lectura"):
+        previous, (co, tris) = mesh_cache.tracked_triangles(target, depsgraph)
+    region = _changed_region(*previous, co, tris) if previous is not None else None
+    if region is not None and not region:
+        return 0
+
+    gems = [o for o in scene.objects if o.get(LIVE_SNAP_KEY) == target.name and o != target]
+    if region is not None:
+        gems = _gems_in_region(gems, region, props.backtrack)
+
+    cast = object_cast(target.evaluated_get(depsgraph))
+    moved = sum(1 for obj in gems if snap_object(obj, props, cast))
+    profile_count("objetos_escritos", moved)
+    return moved
+
+
+def _live_snap_flush():
+    """Timer: repega cuando el objetivo lleva `live_delay` segundos sin cambiar."""
+    scene = bpy.context.scene
+    props = getattr(scene, "snapz_props", None)
+    if props is None or not props.live_link or props.target is None:
+        _live_state["pending"] = False
+        return None
+
+    wait = props.live_delay - (time.perf_counter() - _live_state["last_change"])
+    if wait > 0.0:
+        return wait
+
+    _live_state["pending"] = False
+    live_snap(scene, props.target, bpy.context.evaluated_depsgraph_get())
+    return None
+
+
+def live_link_toggled(props, context):
+    """Al activar el enlace se lee el objetivo, así el primer cambio ya es parcial."""
+    mesh_cache.untrack()
+    if props.live_link and props.target is not None and props.target.type == 'MESH':
+        mesh_cache.tracked_triangles(props.target, context.evaluated_depsgraph_get())
+
+
+@bpy.app.handlers.persistent
+def live_snap_update(scene, depsgraph):
+    """Agenda el repegado (con retardo) cuando cambia la geometría o la posición del objetivo."""
+    props = getattr(scene, "snapz_props", None)
+    if props is None or not props.live_link or props.target is None or props.target.type != 'MESH':
+        return
+    target = props.target
+    for update in depsgraph.updates:
+        if (
+            isinstance(update.id, bpy.types.Object)
+            and update.id.original == target
+            and (update.is_updated_geometry or update.is_updated_transform)
+        ):
+            break
+    else:
+        return
+
+    _live_state["last_change"] = time.perf_counter()
+    if not _live_state["pending"]:
+        _live_state["pending"] = True
+        bpy.app.timers.register(_live_snap_flush, first_interval=props.live_delay)
+
+
+# ------------------------------
+# Operador aplicar transform + limpiar constraints
+# ------------------------------
+
+class OBJECT_OT_apply_and_clear_constraints(bpy.types.Operator):
+    bl_idname = "object.apply_and_clear_constraints"
+    bl_label = "Aplicar Visual y Limpiar Constraints"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        sel_objs = context.selected_objects
+        if not sel_objs:
+            self.report({'WARNING'}, "No hay objetos seleccionados.")
+            return {'CANCELLED'}
+
+        for obj in sel_objs:
+            # Activa el objeto para aplicar
+            context.view_layer.objects.active = obj
+
+            with profile_phase("bpy.ops"):
+                # Aplica transformaciones visuales
+                bpy.ops.object.visual_transform_apply()
+
+                # Limpia constraints
+                bpy.ops.object.constraints_clear()
+
+        self.report({'INFO'}, f"Aplicadas y limpiadas constraints en {len(sel_objs)} objeto(s).")
+        return {'FINISHED'}
+
+
+#EdgeLoop
+class MESH_OT_separar_loop_shrinkwrap(bpy.types.Operator):
+    """Separa el loop seleccionado como objetos nuevos (Loose Parts) y añade Shrinkwrap"""
+    bl_idname = "mesh.separar_loop_shrinkwrap_only"
+    bl_label = "Loop → Shrinkwrap"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        obj = context.active_object
+        if not obj or obj.type != 'MESH':
+            self.report({'ERROR'}, "Selecciona un objeto de tipo malla")
+            return {'CANCELLED'}
+
+        # Cambiar a Edit Mode
+        bpy.ops.object.mode_set(mode='EDIT')
+
+        # Duplicar selección
+        bpy.ops.mesh.duplicate()
+
+        # Separar en partes sueltas (cada isla de edges será un objeto)
+        bpy.ops.mesh.separate(type='LOOSE')
+
+        # Volver a modo objeto
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+        # Obtener los objetos resultantes
+        sel_objs = context.selected_objects
+        new_objs = [o for o in sel_objs if o != obj]
+
+        if not new_objs:
+            self.report({'ERROR'}, "No se pudo separar el loop")
+            return {'CANCELLED'}
+
+        # Agregar Shrinkwrap a cada nuevo objeto
+        for new_obj in new_objs:
+            shrinkwrap = new_obj.modifiers.new(name="Shrinkwrap", type='SHRINKWRAP')
+            shrinkwrap.target = obj
+            shrinkwrap.wrap_method = 'NEAREST_SURFACEPOINT'
+
+        # Deseleccionar todo y dejar seleccionados solo los nuevos objetos
+        bpy.ops.object.select_all(action='DESELECT')
+        for new_obj in new_objs:
+            new_obj.select_set(True)
+        context.view_layer.objects.active = new_objs[0]
+
+        self.report({'INFO'}, f"{len(new_objs)} loops separados como objetos con Shrinkwrap hacia '{obj.name}'")
+        return {'FINISHED'}
+
+class OBJECT_OT_convert_to_curve(bpy.types.Operator):
+    """Convierte los objetos seleccionados en curvas y los organiza en la colección 'Curves'"""
+    bl_idname = "object.convert_to_curve"
+    bl_label = "Convertir a Curva"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        sel_objs = context.selected_objects
+        if not sel_objs:
+            self.report({'ERROR'}, "No hay objetos seleccionados")
+            return {'CANCELLED'}
+
+        # Buscar colección "Curves" en la escena activa
+        curves_collection = None
+        for coll in context.scene.collection.children:
+            if coll.name == "Curves":
+                curves_collection = coll
+                break
+
+        # Si no existe, crearla en la escena actual
+        if not curves_collection:
+            curves_collection = bpy.data.collections.new("Curves")
+            context.scene.collection.children.link(curves_collection)
+
+        converted = []
+
+        for obj in sel_objs:
+            obj_name = obj.name
+
+            # Hacer activo para convertir
+            context.view_layer.objects.active = obj
+
+            # Convertir a curva
+            bpy.ops.object.convert(target='CURVE')
+
+            # Obtener el objeto convertido (sigue con el mismo nombre)
+            obj_curve = bpy.data.objects.get(obj_name)
+            if obj_curve:
+                obj_curve.show_in_front = True
+                converted.append(obj_curve)
+
+                # Mover a colección "Curves" de la escena activa
+                # 1. Quitar de las colecciones actuales
+                for coll in obj_curve.users_collection:
+                    coll.objects.unlink(obj_curve)
+                # 2. Agregar a "Curves"
+                curves_collection.objects.link(obj_curve)
+
+        if converted:
+            self.report({'INFO'}, f"{len(converted)} objeto(s) convertidos a curva y movidos a 'Curves'")
+        else:
+            self.report({'WARNING'}, "No se pudieron convertir los objetos seleccionados")
+
+        return {'FINISHED'}
+
+
+class OBJECT_OT_curve_distribute_gems(bpy.types.Operator):
+    """Distribuye las gemas seleccionadas a lo largo de la curva activa"""
+    bl_idname = "object.curve_distribute_gems"
+    bl_label = "Distribuir en Curva"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    count: IntProperty(
+        name="Cantidad",
+        description="Número de gemas (0 = las seleccionadas; si es mayor se crean duplicados enlazados)",
+        default=0,
+        min=0, max=10000,
+    )
+    spacing_mode: EnumProperty(
+        name="Espaciado",
+        items=[
+            ('EVEN', "Uniforme", "Reparte las gemas en todo el tramo"),
+            ('SIZE', "Por tamaño", "Separa según el diámetro de la gema más el hueco"),
+        ],
+        default='EVEN',
+    )
+    gap: FloatProperty(
+        name="Hueco",
+        description="Separación entre gemas en el modo por tamaño",
+        default=0.1,
+        min=0.0, max=100.0,
+        step=1, precision=3,
+    )
+    start: FloatProperty(
+        name="Inicio",
+        default=0.0,
+        min=0.0, max=100.0,
+        subtype='PERCENTAGE',
+    )
+    end: FloatProperty(
+        name="Fin",
+        default=100.0,
+        min=0.0, max=100.0,
+        subtype='PERCENTAGE',
+    )
+    orientation: EnumProperty(
+        name="Orientación",
+        items=[
+            ('RADIAL', "Radial", "Z de la gema hacia fuera de la curva (bandas)"),
+            ('PLANE', "Plano", "Z de la gema a la normal del plano de la curva"),
+        ],
+        default='RADIAL',
+    )
+
+    def execute(self, context):
+        curve = context.active_object
+        if not curve or curve.type != 'CURVE' or not curve.data.splines:
+            self.report({'ERROR'}, "La curva debe ser el objeto activo.")
+            return {'CANCELLED'}
+
+        gems = sorted((o for o in context.selected_objects if o != curve), key=lambda o: o.name)
+        if not gems:
+            self.report({'WARNING'}, "Selecciona las gemas y después la curva.")
+            return {'CANCELLED'}
+
+        with profile_phase("tabla"):
+            lut = get_curve_lut(curve)
+        if lut is None:
+            self.report({'ERROR'}, "La curva no tiene longitud.")
+            return {'CANCELLED'}
+
+        total = lut["lengths"][-1]
+        d0 = total * min(self.start, self.end) / 100.0
+        d1 = total * max(self.start, self.end) / 100.0
+        count = self.count or len(gems)
+
+        if self.spacing_mode == 'SIZE':
+            # Cada paso usa el diámetro de las dos gemas vecinas (los duplicados miden como la última)
+            diam = np.array([o.dimensions.x for o in gems[:count]] + [gems[-1].dimensions.x] * (count - len(gems)))
+            offsets = np.concatenate(([0.0], np.cumsum((diam[:-1] + diam[1:]) * 0.5 + self.gap)))
+            count = max(int(np.count_nonzero(offsets <= d1 - d0 + 1e-6)), 1)
+            offsets = offsets[:count]
+            step = offsets[-1] / (count - 1) if count > 1 else 0.0
+        elif lut["cyclic"] and d1 - d0 >= total - 1e-9:
+            # Curva cerrada completa: la última no se encima con la primera
+            step = (d1 - d0) / count
+        else:
+            step = (d1 - d0) / max(count - 1, 1)
+
+        # Completar con duplicados enlazados (comparten malla) de la última gema
+        src = gems[-1]
+        while len(gems) < count:
+            dup = src.copy()
+            for coll in src.users_collection:
+                coll.objects.link(dup)
+            gems.append(dup)
+        gems = gems[:count]
+
+        if self.spacing_mode == 'SIZE':
+            distances = d0 + offsets
+        else:
+            distances = d0 + np.arange(count) * step
+        if lut["cyclic"]:
+            distances = np.mod(distances, total)
+        pos, tan, nrm = curve_lut_lookup(lut, distances, self.orientation)
+        scales = np.array([o.matrix_world.to_scale()[:] for o in gems])
+        mats = frames_to_matrices(pos, tan, nrm, scales)
+
+        with profile_phase("escritura"):
+            for obj, mat in zip(gems, mats.tolist()):
+                obj.matrix_world = Matrix(mat)
+
+        self.report({'INFO'}, f"{count} gema(s) distribuidas en '{curve.name}' ({step:.3f} mm).")
+        return {'FINISHED'}
+
+
+
+#EscalaMenos1
+# --- Operador: Restar 0.1 en Z ---
+class OBJECT_OT_scale_z_minus(bpy.types.Operator):
+    bl_idname = "object.scale_z_minus"
+    bl_label = "Restar 0.1 en Z"
+    bl_description = "Resta 0.1 en la escala Z de los objetos seleccionados"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        for obj in context.selected_objects:
+            if obj.type == 'MESH':
+                obj.scale.z -= 0.1
+
+        # Cambiar texto del botón
+        context.scene.scale_z_label = "Escalado"
+        return {'FINISHED'}
+
+
+# --- Operador: Igualar Z a X ---
+class OBJECT_OT_scale_z_equal_x(bpy.types.Operator):
+    bl_idname = "object.scale_z_equal_x"
+    bl_label = "Escala Original"
+    bl_description = "Iguala la escala Z al valor de la escala X en los objetos seleccionados"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        for obj in context.selected_objects:
+            if obj.type == 'MESH':
+                obj.scale.z = obj.scale.x
+
+        # Regresar el botón al texto original
+        context.scene.scale_z_label = "Restar 0.1 en Z"
+        return {'FINISHED'}
+
+
+#Mover En Z 1
+# Operador para subir en Z local
+class OBJECT_OT_move_z_up(bpy.types.Operator):
+    bl_idname = "object.move_z_up"
+    bl_label = "Subir +1 mm"
+    bl_description = "Mueve el objeto 1 mm en su eje Z local, sin importar la escala"
+
+    def execute(self, context):
+        for obj in context.selected_objects:
+            if INSTANCE_FAMILY_KEY in obj:
+                nudge_instances(obj, 0.1)
+            elif obj.type == 'MESH':
+                # Vector Z local
+                local_offset = mathutils.Vector((0, 0, 0.1))  # 1 mm = 0.001 m
+                # Ajustar por la escala del objeto
+                world_offset = (obj.matrix_world.to_3x3() @ local_offset) / obj.scale.z
+                obj.location += world_offset
+        context.scene.z_up_count += 1
+        return {'FINISHED'}
+    
+    # Operador para bajar en Z local
+class OBJECT_OT_move_z_down(bpy.types.Operator):
+    bl_idname = "object.move_z_down"
+    bl_label = "Bajar -1 mm"
+    bl_description = "Mueve el objeto -1 mm en su eje Z local, sin importar la escala"
+
+    def execute(self, context):
+        for obj in context.selected_objects:
+            if INSTANCE_FAMILY_KEY in obj:
+                nudge_instances(obj, -0.1)
+            elif obj.type == 'MESH':
+                local_offset = mathutils.Vector((0, 0, -0.1))  # -1 mm
+                world_offset = (obj.matrix_world.to_3x3() @ local_offset) / obj.scale.z
+                obj.location += world_offset
+        context.scene.z_down_count += 1
+        return {'FINISHED'}
+    
+
+#Seleccionar Rounds, Prongs, Cutter
+
+# --------- Operadores de Seleccion ----------
+
+class OBJECT_OT_select_all_jewelry(bpy.types.Operator):
+    bl_idname = "object.select_all_jewelry"
+    bl_label = "Round + Prongs + Cutter"
+    bl_description = "Selecciona todos los objetos que empiecen con 'Round', 'Prongs' o 'Cutter'"
+    bl_options = {"REGISTER", "UNDO"}
+
+    def execute(self, context):
+        bpy.ops.object.select_all(action='DESELECT')
+        active_obj = None
+        for obj in context.scene.objects:
+            if obj.name.startswith(("Round", "Prongs", "Cutter")):
+                obj.select_set(True)
+                if active_obj is None:
+                    active_obj = obj
+        if active_obj:
+            context.view_layer.objects.active = active_obj
+        return {"FINISHED"}
+
+
+class OBJECT_OT_select_round(bpy.types.Operator):
+    bl_idname = "object.select_round"
+    bl_label = "  "
+    bl_description = "Selecciona todos los objetos que empiecen con 'Round'"
+    bl_options = {"REGISTER", "UNDO"}
+
+    def execute(self, context):
+        bpy.ops.object.select_all(action='DESELECT')
+        active_obj = None
+        for obj in context.scene.objects:
+            if obj.name.startswith("Round"):
+                obj.select_set(True)
+                if active_obj is None:
+                    active_obj = obj
+        if active_obj:
+            context.view_layer.objects.active = active_obj
+        return {"FINISHED"}
+
+class OBJECT_OT_select_prongs(bpy.types.Operator):
+    bl_idname = "object.select_prongs"
+    bl_label = "  "
+    bl_description = "Selecciona todos los objetos que empiecen con 'Prongs'"
+    bl_options = {"REGISTER", "UNDO"}
+
+    def execute(self, context):
+        bpy.ops.object.select_all(action='DESELECT')
+        active_obj = None
+        for obj in context.scene.objects:
+            if obj.name.startswith("Prongs"):
+                obj.select_set(True)
+                if active_obj is None:
+                    active_obj = obj
+        if active_obj:
+            context.view_layer.objects.active = active_obj
+        return {"FINISHED"}
+
+
+class OBJECT_OT_select_cutter(bpy.types.Operator):
+    bl_idname = "object.select_cutter"
+    bl_label = "  "
+    bl_description = "Selecciona todos los objetos que empiecen con 'Cutter'"
+    bl_options = {"REGISTER", "UNDO"}
+
+    def execute(self, context):
+        bpy.ops.object.select_all(action='DESELECT')
+        active_obj = None
+        for obj in context.scene.objects:
+            if obj.name.startswith("Cutter"):
+                obj.select_set(True)
+                if active_obj is None:
+                    active_obj = obj
+        if active_obj:
+            context.view_layer.objects.active = active_obj
+        return {"FINISHED"}
+
+#Mirror
+
+class OBJECT_OT_mirror_jewelry(bpy.types.Operator):
+    """Crea copias espejo enlazadas (comparten malla) de los objetos seleccionados"""
+    bl_idname = "object.mirror_jewelry"
+    bl_label = "Mirror"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    axis: EnumProperty(
+        name="Plano",
+        description="Eje perpendicular al plano de espejo",
+        items=[
+            ('X', "X", "Espejo en el plano YZ"),
+            ('Y', "Y", "Espejo en el plano XZ"),
+            ('Z', "Z", "Espejo en el plano XY"),
+        ],
+        default='X',
+    )
+    pivot: EnumProperty(
+        name="Pivote",
+        items=[
+            ('WORLD', "Origen del mundo", "El plano pasa por el origen del mundo"),
+            ('ACTIVE', "Objeto activo", "El plano pasa por el origen del objeto activo"),
+        ],
+        default='WORLD',
+    )
+    keep_positive_scale: BoolProperty(
+        name="Sin escala negativa",
+        description="Invierte además la X local para que las copias no queden con escala negativa (normales correctas en gemas, prongs y cutters)",
+        default=True,
+    )
+
+    def execute(self, context):
+        sel_objs = [o for o in context.selected_objects if o != context.active_object or self.pivot == 'WORLD']
+        if not sel_objs:
+            self.report({'WARNING'}, "No hay objetos seleccionados.")
+            return {'CANCELLED'}
+
+        # Matriz de reflexión en mundo alrededor del pivote
+        axis = "XYZ".index(self.axis)
+        pivot = np.zeros(3)
+        if self.pivot == 'ACTIVE' and context.active_object:
+            pivot = np.array(context.active_object.matrix_world.translation)
+        reflect = np.identity(4)
+        reflect[axis, axis] = -1.0
+        reflect[axis, 3] = 2.0 * pivot[axis]
+
+        # Todas las matrices espejo en una sola pasada
+        mats = np.array([o.matrix_world for o in sel_objs])
+        mirrored = reflect @ mats
+        if self.keep_positive_scale:
+            mirrored[:, :, 0] *= -1.0
+
+        # Crear todas las copias y después enlazarlas
+        dups = []
+        for obj, mat in zip(sel_objs, mirrored.tolist()):
+            dup = obj.copy()
+            dup.matrix_world = Matrix(mat)
+            dups.append(dup)
+
+        for obj, dup in zip(sel_objs, dups):
+            for coll in obj.users_collection:
+                coll.objects.link(dup)
+
+        for obj in sel_objs:
+            obj.select_set(False)
+        for dup in dups:
+            dup.select_set(True)
+
+        self.report({'INFO'}, f"{len(dups)} objeto(s) reflejados en {self.axis}.")
+        return {'FINISHED'}
+
+
+#Prongs en lote
+
+def _prong_profile(radius, top, bottom, dome_rings=3):
+    """Perfil (radio, z) de un prong: cilindro con remate semiesférico."""
+    profile = [(radius, -bottom), (radius, top)]
+    for i in range(1, dome_rings):
+        a = 0.5 * np.pi * i / dome_rings
+        profile.append((radius * np.cos(a), top + radius * np.sin(a)))
+    return profile
+
+
+def prong_mesh(size, count, diameter, top, bottom, angle, segments=12):
+    """
+    Malla con `count` prongs repartidos en el filetín de una piedra de `size` mm.
+    Se reutiliza entre todas las piedras con el mismo tamaño y los mismos
+    parámetros: todos forman parte del nombre, así que cambiar cualquiera
+    crea una malla nueva en lugar de reutilizar una con otra forma.
+    """
+    name = f"Prongs_{size:.2f}_{count}_{diameter:g}_{top:g}_{bottom:g}_{angle:g}_{segments}"
+    mesh = bpy.data.meshes.get(name)
+    if mesh is not None:
+        return mesh
+
+    profile = _prong_profile(diameter * size * 0.5, top * size, bottom * size)
+    theta = np.linspace(0.0, 2.0 * np.pi, segments, endpoint=False)
+    rings = np.array([
+        np.column_stack((r * np.cos(theta), r * np.sin(theta), np.full(segments, z)))
+        for r, z in profile
+    ]).reshape(-1, 3)
+    pole = np.array([[0.0, 0.0, top * size + diameter * size * 0.5]])
+    template = np.vstack((rings, pole))
+
+    n_rings = len(profile)
+    faces = [tuple(range(segments - 1, -1, -1))]  # base
+    for k in range(n_rings - 1):
+        a, b = k * segments, (k + 1) * segments
+        faces += [(a + i, a + (i + 1) % segments, b + (i + 1) % segments, b + i) for i in range(segments)]
+    last, pole_idx = (n_rings - 1) * segments, n_rings * segments
+    faces += [(last + i, last + (i + 1) % segments, pole_idx) for i in range(segments)]
+
+    # Un prong por ángulo, sobre el contorno de la piedra
+    phi = angle + np.linspace(0.0, 2.0 * np.pi, count, endpoint=False)
+    offsets = np.column_stack((np.cos(phi), np.sin(phi), np.zeros(count))) * size * 0.5
+    verts = (template[None, :, :] + offsets[:, None, :]).reshape(-1, 3)
+    stride = len(template)
+    all_faces = [tuple(v + j * stride for v in face) for j in range(count) for face in faces]
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.from_pydata(verts.tolist(), [], all_faces)
+    mesh.update()
+    return mesh
+
+
+def gem_sizes(gems):
+    """Diámetro (mm, redondeado a centésimas) de cada gema Round."""
+    return np.round([max(o.dimensions.x, o.dimensions.y) for o in gems], 2)
+
+
+def unscaled_matrices(objs):
+    """Matrices mundo (N, 4, 4) sin la escala de cada objeto."""
+    mats = np.array([o.matrix_world for o in objs], dtype=np.float64)
+    norms = np.linalg.norm(mats[:, :3, :3], axis=1, keepdims=True)
+    mats[:, :3, :3] /= np.where(norms > 0.0, norms, 1.0)
+    return mats
+
+
+class OBJECT_OT_add_prongs_batch(bpy.types.Operator):
+    """Crea los prongs de todas las gemas Round seleccionadas compartiendo una malla por tamaño"""
+    bl_idname = "object.add_prongs_batch"
+    bl_label = "Prongs"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    count: IntProperty(name="Cantidad", default=4, min=2, max=12)
+    diameter: FloatProperty(
+        name="Diámetro",
+        description="Diámetro del prong (proporción del tamaño de la piedra)",
+        default=0.18, min=0.01, max=1.0, precision=3,
+    )
+    top: FloatProperty(
+        name="Alto",
+        description="Altura sobre el filetín (proporción del tamaño de la piedra)",
+        default=0.3, min=0.0, max=2.0, precision=3,
+    )
+    bottom: FloatProperty(
+        name="Bajo",
+        description="Profundidad bajo el filetín (proporción del tamaño de la piedra)",
+        default=0.7, min=0.0, max=3.0, precision=3,
+    )
+    angle: FloatProperty(name="Giro", default=0.785398, subtype='ANGLE')
+
+    def execute(self, context):
+        gems = [o for o in context.selected_objects if o.type == 'MESH' and o.name.startswith("Round")]
+        if not gems:
+            self.report({'WARNING'}, "No hay gemas Round seleccionadas.")
+            return {'CANCELLED'}
+
+        with profile_phase("lectura"):
+            sizes = gem_sizes(gems)
+            mats = unscaled_matrices(gems)
+
+        with profile_phase("mallas"):
+            meshes = {
+                size: prong_mesh(size, self.count, self.diameter, self.top, self.bottom, self.angle)
+                for size in np.unique(sizes).tolist()
+            }
+
+        with profile_phase("escritura"):
+            prongs = []
+            for gem, size, mat in zip(gems, sizes.tolist(), mats.tolist()):
+                obj = bpy.data.objects.new("Prongs", meshes[size])
+                obj.matrix_world = Matrix(mat)
+                gem.users_collection[0].objects.link(obj)
+                prongs.append(obj)
+
+            for obj in context.selected_objects:
+                obj.select_set(False)
+            for obj in prongs:
+                obj.select_set(True)
+        profile_count("objetos_escritos", len(prongs))
+
+        self.report({'INFO'}, f"{len(prongs)} prong(s) con {len(meshes)} malla(s) compartida(s).")
+        return {'FINISHED'}
+
+
+#Instancias (Geometry Nodes)
+
+# Familias que se pueden instanciar y propiedad que marca la nube de puntos
+INSTANCE_FAMILIES = ("Round", "Prongs", "Cutter")
+INSTANCE_FAMILY_KEY = "jt_instance_family"
+
+
+def _instancing_node_group(proto_coll):
+    """Node group que instancia la colección de prototipos sobre los puntos."""
+    name = f"{proto_coll.name}_GN"
+    ng = bpy.data.node_groups.get(name)
+    if ng is None:
+        ng = bpy.data.node_groups.new(name, 'GeometryNodeTree')
+        if hasattr(ng, "interface"):
+            ng.interface.new_socket("Geometry", in_out='INPUT', socket_type='NodeSocketGeometry')
+            ng.interface.new_socket("Geometry", in_out='OUTPUT', socket_type='NodeSocketGeometry')
+        else:
+            ng.inputs.new('NodeSocketGeometry', "Geometry")
+            ng.outputs.new('NodeSocketGeometry', "Geometry")
+
+        nodes, links = ng.nodes, ng.links
+        n_in = nodes.new('NodeGroupInput')
+        n_out = nodes.new('NodeGroupOutput')
+        n_coll = nodes.new('GeometryNodeCollectionInfo')
+        n_coll.name = "Prototipos"
+        n_coll.inputs["Separate Children"].default_value = True
+        n_coll.inputs["Reset Children"].default_value = True
+        n_inst = nodes.new('GeometryNodeInstanceOnPoints')
+        n_inst.inputs["Pick Instance"].default_value = True
+
+        links.new(n_in.outputs[0], n_inst.inputs["Points"])
+        links.new(n_coll.outputs[0], n_inst.inputs["Instance"])
+        for attr, data_type, socket in (
+            ("instance_index", 'INT', "Instance Index"),
+            ("rotation", 'FLOAT_VECTOR', "Rotation"),
+            ("scale", 'FLOAT_VECTOR', "Scale"),
+        ):
+            n_attr = nodes.new('GeometryNodeInputNamedAttribute')
+            n_attr.data_type = data_type
+            n_attr.inputs["Name"].default_value = attr
+            out = next(o for o in n_attr.outputs if o.enabled and o.name == "Attribute")
+            links.new(out, n_inst.inputs[socket])
+        links.new(n_inst.outputs[0], n_out.inputs[0])
+
+    ng.nodes["Prototipos"].inputs["Collection"].default_value = proto_coll
+    return ng
+
+
+def _instance_arrays(cloud):
+    """Lee posiciones, rotaciones, escalas e índices de una nube de instancias."""
+    mesh = cloud.data
+    count = len(mesh.vertices)
+    pos = _foreach_array(mesh.vertices, "co", 3).reshape(count, 3)
+    rot = _foreach_array(mesh.attributes["rotation"].data, "vector", 3).reshape(count, 3)
+    scl = _foreach_array(mesh.attributes["scale"].data, "vector", 3).reshape(count, 3)
+    idx = np.empty(count, dtype=np.int32)
+    mesh.attributes["instance_index"].data.foreach_get("value", idx)
+    return pos, rot, scl, idx
+
+
+def nudge_instances(cloud, distance):
+    """Mueve cada instancia de la nube a lo largo de su Z local (sin importar la escala)."""
+    mesh = cloud.data
+    pos, rot, _, _ = _instance_arrays(cloud)
+    pos += euler_xyz_to_matrices(rot)[:, :, 2] * distance
+    mesh.vertices.foreach_set("co", pos.astype(np.float32).ravel())
+    mesh.update()
+
+
+def instancing_setup(cloud):
+    """
+    (node group, colección de prototipos) de una nube de instancias, o None si
+    le quitaron o renombraron el modificador JT_Instancing o el nodo de prototipos.
+    """
+    mod = cloud.modifiers.get("JT_Instancing")
+    node_group = mod.node_group if mod is not None and mod.type == 'NODES' else None
+    node = node_group.nodes.get("Prototipos") if node_group is not None else None
+    proto_coll = node.inputs["Collection"].default_value if node is not None else None
+    if proto_coll is None:
+        return None
+    return node_group, proto_coll
+
+
+def _free_names(family, taken):
+    """Nombres '<familia>.0001', '<familia>.0002'... que no estén en `taken` (se van agregando)."""
+    n = 0
+    while True:
+        n += 1
+        name = f"{family}.{n:04d}"
+        if name not in taken:
+            taken.add(name)
+            yield name
+
+
+def instance_matrices(cloud):
+    """
+    (prototipos, índice de prototipo (N,), matrices mundo (N, 4, 4)) de las
+    instancias de una nube, o None si la nube está rota.
+    """
+    setup = instancing_setup(cloud)
+    if setup is None:
+        return None
+    protos = sorted(setup[1].objects, key=lambda o: o.name)
+    pos, rot, scl, idx = _instance_arrays(cloud)
+    return protos, idx, np.array(cloud.matrix_world, dtype=np.float64) @ compose_matrices(pos, rot, scl)
+
+
+def _family_objects(scene, family):
+    return [
+        o for o in scene.objects
+        if o.type == 'MESH' and o.name.startswith(family) and INSTANCE_FAMILY_KEY not in o
+    ]
+
+
+class OBJECT_OT_instance_jewelry(bpy.types.Operator):
+    """Convierte cada familia Round/Prongs/Cutter en una nube de puntos instanciada con Geometry Nodes"""
+    bl_idname = "object.instance_jewelry"
+    bl_label = "Instanciar"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    families: EnumProperty(
+        name="Familias",
+        items=[(f, f, "") for f in INSTANCE_FAMILIES],
+        options={'ENUM_FLAG'},
+        default=set(INSTANCE_FAMILIES),
+    )
+
+    def execute(self, context):
+        scene = context.scene
+        total = 0
+
+        for family in INSTANCE_FAMILIES:
+            if family not in self.families:
+                continue
+            objs = sorted(_family_objects(scene, family), key=lambda o: o.name)
+            if not objs:
+                continue
+
+            # Colección de prototipos (excluida de la vista)
+            proto_coll = bpy.data.collections.new(f"JT_Prototipos_{family}")
+            scene.collection.children.link(proto_coll)
+
+            # Un prototipo por malla distinta
+            protos = {}
+            for obj in objs:
+                if obj.data not in protos:
+                    proto = obj.copy()
+                    proto.name = f"JT_{family}_{len(protos):04d}"
+                    proto.parent = None
+                    proto.constraints.clear()
+                    proto.matrix_world = Matrix.Identity(4)
+                    proto_coll.objects.link(proto)
+                    protos[obj.data] = len(protos)
+
+            # Transformaciones de todas las piezas
+            count = len(objs)
+            pos = np.empty((count, 3), dtype=np.float32)
+            rot = np.empty((count, 3), dtype=np.float32)
+            scl = np.empty((count, 3), dtype=np.float32)
+            idx = np.empty(count, dtype=np.int32)
+            for i, obj in enumerate(objs):
+                loc, quat, scale = obj.matrix_world.decompose()
+                pos[i] = loc
+                rot[i] = quat.to_euler('XYZ')
+                scl[i] = scale
+                idx[i] = protos[obj.data]
+
+            # Nube de puntos con atributos
+            mesh = bpy.data.meshes.new(f"{family}_Instancias")
+            mesh.vertices.add(count)
+            mesh.vertices.foreach_set("co", pos.ravel())
+            mesh.attributes.new("rotation", 'FLOAT_VECTOR', 'POINT').data.foreach_set("vector", rot.ravel())
+            mesh.attributes.new("scale", 'FLOAT_VECTOR', 'POINT').data.foreach_set("vector", scl.ravel())
+            mesh.attributes.new("instance_index", 'INT', 'POINT').data.foreach_set("value", idx)
+            mesh.update()
+
+            cloud = bpy.data.objects.new(f"{family}_Instancias", mesh)
+            cloud[INSTANCE_FAMILY_KEY] = family
+            for coll in objs[0].users_collection:
+                coll.objects.link(cloud)
+            mod = cloud.modifiers.new("JT_Instancing", 'NODES')
+            mod.node_group = _instancing_node_group(proto_coll)
+
+            bpy.data.batch_remove(objs)
+            layer_coll = context.view_layer.layer_collection.children.get(proto_coll.name)
+            if layer_coll:
+                layer_coll.exclude = True
+            total += count
+
+        if total == 0:
+            self.report({'WARNING'}, "No hay objetos Round, Prongs o Cutter para instanciar.")
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, f"{total} pieza(s) convertidas a instancias.")
+        return {'FINISHED'}
+
+
+class OBJECT_OT_realize_jewelry(bpy.types.Operator):
+    """Vuelve a crear un objeto por pieza a partir de las nubes de instancias"""
+    bl_idname = "object.realize_jewelry"
+    bl_label = "Realizar"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        clouds = [o for o in context.scene.objects if INSTANCE_FAMILY_KEY in o]
+        if not clouds:
+            self.report({'WARNING'}, "No hay instancias en la escena.")
+            return {'CANCELLED'}
+
+        total = 0
+        to_remove = []
+        broken = []
+        # Nombres únicos desde el principio: con el mismo nombre Blender busca un sufijo libre por cada copia
+        taken = set(bpy.data.objects.keys())
+        names = {}
+        for cloud in clouds:
+            family = cloud[INSTANCE_FAMILY_KEY]
+            instances = instance_matrices(cloud)
+            if instances is None:
+                broken.append(cloud.name)
+                continue
+            protos, idx, mats = instances
+            node_group, proto_coll = instancing_setup(cloud)
+
+            new_objs = []
+            free = names.setdefault(family, _free_names(family, taken))
+            for i, mat in zip(idx.tolist(), mats.tolist()):
+                obj = protos[i].copy()
+                obj.name = next(free)
+                obj.matrix_world = Matrix(mat)
+                new_objs.append(obj)
+            for coll in cloud.users_collection:
+                for obj in new_objs:
+                    coll.objects.link(obj)
+
+            to_remove.append(cloud)
+            to_remove.extend(protos)
+            bpy.data.collections.remove(proto_coll)
+            bpy.data.node_groups.remove(node_group)
+            total += len(new_objs)
+
+        bpy.data.batch_remove(to_remove)
+        if broken:
+            self.report({'ERROR'}, f"Sin modificador JT_Instancing válido (no se realizaron): {', '.join(broken)}")
+            if not total:
+                return {'CANCELLED'}
+        self.report({'INFO'}, f"{total} pieza(s) realizadas.")
+        return {'FINISHED'}
+
+
+#Proxy de visualización
+
+PROXY_COLORS = {
+    "Round": (0.6, 0.85, 1.0, 0.9),
+    "Prongs": (1.0, 0.8, 0.3, 0.9),
+    "Cutter": (1.0, 0.3, 0.3, 0.5),
+}
+# Guarda el display_type original de cada objeto en proxy
+PROXY_DISPLAY_KEY = "jt_display_type"
+DISC_SEGMENTS = 12
+
+# Selección vista en la última pasada, lotes del overlay, handle de dibujo y
+# objetos cuya selección cambió y esperan al timer (None = revisar todos)
+_proxy_state = {"selected": None, "batches": None, "draw_handle": None, "pending": set()}
+
+
+def _proxy_object(obj, families, selected):
+    """Caja o detalle completo para un objeto; devuelve si cambió."""
+    if obj.type != 'MESH':
+        return False
+    if families and obj.name.startswith(families) and obj.name not in selected:
+        if PROXY_DISPLAY_KEY not in obj:
+            obj[PROXY_DISPLAY_KEY] = obj.display_type
+        if obj.display_type != 'BOUNDS':
+            obj.display_type = 'BOUNDS'
+            return True
+    elif PROXY_DISPLAY_KEY in obj:
+        obj.display_type = obj[PROXY_DISPLAY_KEY]
+        del obj[PROXY_DISPLAY_KEY]
+        return True
+    return False
+
+
+def apply_proxy(scene, selected, names=None):
+    """
+    Pasa a caja las familias elegidas (salvo la selección) y restaura el resto.
+    Con `names` solo se revisan esos objetos (los que cambiaron de selección).
+    """
+    families = tuple(scene.proxy_families) if scene.proxy_mode != 'OFF' else ()
+    if names is None:
+        objs = scene.objects
+    else:
+        objs = [obj for obj in map(scene.objects.get, names) if obj is not None]
+    changed = sum(1 for obj in objs if _proxy_object(obj, families, selected))
+    _proxy_state["selected"] = selected
+    if changed or names is None:
+        _proxy_state["batches"] = None
+    profile_count("objetos_escritos", changed)
+
+
+def disc_triangles(mats, radii, segments=DISC_SEGMENTS):
+    """Triángulos (N * segments * 3, 3) de un disco por objeto en su plano XY local."""
+    ang = np.linspace(0.0, 2.0 * np.pi, segments + 1)
+    cos, sin = np.cos(ang)[None, :, None], np.sin(ang)[None, :, None]
+    center = mats[:, :3, 3]
+    rim = center[:, None, :] + radii[:, None, None] * (cos * mats[:, None, :3, 0] + sin * mats[:, None, :3, 1])
+    hub = np.repeat(center[:, None, :], segments, axis=1)
+    return np.stack((hub, rim[:, :-1], rim[:, 1:]), axis=2).reshape(-1, 3).astype(np.float32)
+
+
+def _overlay_shader():
+    try:
+        return gpu.shader.from_builtin('UNIFORM_COLOR')
+    except ValueError:  # Blender 3.x
+        return gpu.shader.from_builtin('3D_UNIFORM_COLOR')
+
+
+def _overlay_batches(scene):
+    """Un lote por familia con los discos de todos los objetos en proxy."""
+    shader = _overlay_shader()
+    batches = []
+    for family in scene.proxy_families:
+        objs = [o for o in scene.objects if PROXY_DISPLAY_KEY in o and o.name.startswith(family)]
+        if not objs:
+            continue
+        radii = np.array([max(o.dimensions.x, o.dimensions.y) for o in objs]) * 0.5
+        tris = disc_triangles(unscaled_matrices(objs), radii)
+        batches.append((PROXY_COLORS[family], gpu_batch.batch_for_shader(shader, 'TRIS', {"pos": tris})))
+    return shader, batches
+
+
+def draw_proxy_overlay():
+    scene = bpy.context.scene
+    if getattr(scene, "proxy_mode", 'OFF') != 'OVERLAY':
+        return
+    if _proxy_state["batches"] is None:
+        _proxy_state["batches"] = _overlay_batches(scene)
+    shader, batches = _proxy_state["batches"]
+    gpu.state.blend_set('ALPHA')
+    gpu.state.depth_test_set('LESS_EQUAL')
+    shader.bind()
+    for color, batch in batches:
+        shader.uniform_float("color", color)
+        batch.draw(shader)
+    gpu.state.depth_test_set('NONE')
+    gpu.state.blend_set('NONE')
+
+
+def _selected_names(view_layer):
+    return frozenset(o.name for o in view_layer.objects.selected)
+
+
+def _sync_draw_handler(scene):
+    """Añade o quita el dibujo del overlay según el modo de la escena."""
+    handle = _proxy_state["draw_handle"]
+    overlay = getattr(scene, "proxy_mode", 'OFF') == 'OVERLAY'
+    if overlay and handle is None:
+        _proxy_state["draw_handle"] = bpy.types.SpaceView3D.draw_handler_add(
+            draw_proxy_overlay, (), 'WINDOW', 'POST_VIEW')
+    elif not overlay and handle is not None:
+        bpy.types.SpaceView3D.draw_handler_remove(handle, 'WINDOW')
+        _proxy_state["draw_handle"] = None
+
+
+def update_proxy_mode(self, context):
+    apply_proxy(context.scene, _selected_names(context.view_layer))
+    _sync_draw_handler(context.scene)
+
+
+def _proxy_flush():
+    """Timer: aplica fuera del handler los cambios de selección pendientes (escribir IDs ahí vuelve a disparar updates)."""
+    scene = bpy.context.scene
+    names, _proxy_state["pending"] = _proxy_state["pending"], set()
+    if getattr(scene, "proxy_mode", 'OFF') != 'OFF':
+        apply_proxy(scene, _selected_names(bpy.context.view_layer), names)
+    return None
+
+
+@bpy.app.handlers.persistent
+def proxy_update(scene, depsgraph):
+    """Detalle completo para lo que se selecciona; el overlay se rehace si algo en proxy se movió."""
+    if getattr(scene, "proxy_mode", 'OFF') == 'OFF':
+        return
+    # Un cambio de selección etiqueta la escena: solo entonces se mira la selección
+    if depsgraph.id_type_updated('SCENE'):
+        selected = _selected_names(bpy.context.view_layer)
+        previous = _proxy_state["selected"]
+        if selected != previous:
+            _proxy_state["selected"] = selected
+            pending = _proxy_state["pending"]
+            if previous is None or pending is None:
+                _proxy_state["pending"] = None
+            else:
+                pending |= selected ^ previous
+            if not bpy.app.timers.is_registered(_proxy_flush):
+                bpy.app.timers.register(_proxy_flush, first_interval=0.0)
+    families = tuple(scene.proxy_families)
+    for update in depsgraph.updates:
+        if (
+            update.is_updated_transform
+            and isinstance(update.id, bpy.types.Object)
+            and update.id.name.startswith(families)
+        ):
+            _proxy_state["batches"] = None
+            break
+
+
+@bpy.app.handlers.persistent
+def proxy_load_post(*args):
+    """Tras abrir un archivo: olvida lo del anterior y vuelve a poner el overlay si la escena lo usa."""
+    scene = bpy.context.scene
+    if bpy.app.timers.is_registered(_proxy_flush):
+        bpy.app.timers.unregister(_proxy_flush)
+    selected = _selected_names(bpy.context.view_layer) if getattr(scene, "proxy_mode", 'OFF') != 'OFF' else None
+    _proxy_state.update(selected=selected, batches=None, pending=set())
+    _sync_draw_handler(scene)
+
+
+#Colisiones
+
+# Distancia entre orígenes por debajo de la cual un Prongs se considera de esa gema
+OWN_PRONG_TOLERANCE = 1e-3
+
+
+def world_bounds(objs):
+    """Cajas alineadas (mín, máx) en mundo de cada objeto, a partir de su bound_box."""
+    corners = np.array([[tuple(c) for c in o.bound_box] for o in objs], dtype=np.float64)
+    mats = np.array([o.matrix_world for o in objs], dtype=np.float64)
+    world = np.einsum("nij,nkj->nki", mats[:, :3, :3], corners) + mats[:, None, :3, 3]
+    return world.min(axis=1), world.max(axis=1)
+
+
+def overlapping_boxes(lo, hi):
+    """
+    Pares (i, j), i < j, cuyas cajas se tocan. Rejilla 3D con celdas del tamaño
+    de la mayor caja, así que dos cajas que se tocan caen en celdas vecinas.
+    """
+    cell = max(float((hi - lo).max()), 1e-9)
+    i, j = relax.pares_en_rejilla(np.floor((lo + hi) * 0.5 / cell).astype(np.int64))
+    touch = np.all((lo[i] <= hi[j]) & (lo[j] <= hi[i]), axis=1)
+    return i[touch], j[touch]
+
+
+class OBJECT_OT_check_collisions(bpy.types.Operator):
+    """Busca intersecciones reales de malla entre gemas, prongs y el metal, y selecciona los implicados"""
+    bl_idname = "object.check_collisions"
+    bl_label = "Colisiones"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    gem_gem: BoolProperty(name="Gema - gema", default=True)
+    gem_prong: BoolProperty(
+        name="Gema - prong",
+        description="Prongs de otras gemas (los de la propia gema se ignoran)",
+        default=True,
+    )
+    prong_prong: BoolProperty(name="Prong - prong", default=False)
+    gem_metal: BoolProperty(
+        name="Gema - metal",
+        description="Gemas que atraviesan la malla objetivo",
+        default=False,
+    )
+
+    def _wanted(self, a, b):
+        kinds = {a, b}
+        if kinds == {"Round"}:
+            return self.gem_gem
+        if kinds == {"Round", "Prongs"}:
+            return self.gem_prong
+        if kinds == {"Prongs"}:
+            return self.prong_prong
+        return False
+
+    def execute(self, context):
+        objs = [
+            o for o in context.selected_objects
+            if o.type == 'MESH' and o.name.startswith(("Round", "Prongs"))
+        ]
+        target = context.scene.snapz_props.target
+        metal = target if self.gem_metal and target is not None and target.type == 'MESH' else None
+        if metal is not None and metal in objs:
+            objs.remove(metal)
+        if len(objs) + (metal is not None) < 2:
+            self.report({'WARNING'}, "Selecciona al menos dos gemas o prongs.")
+            return {'CANCELLED'}
+
+        kinds = ["Round" if o.name.startswith("Round") else "Prongs" for o in objs]
+
+        # La rejilla solo lleva gemas y prongs: la caja del metal las abarca a todas
+        # y volvería la rejilla una sola celda
+        with profile_phase("fase_amplia"):
+            lo, hi = world_bounds(objs)
+            pairs_i, pairs_j = overlapping_boxes(lo, hi)
+            centers = np.array([o.matrix_world.translation for o in objs], dtype=np.float64)
+            own = np.linalg.norm(centers[pairs_i] - centers[pairs_j], axis=1) < OWN_PRONG_TOLERANCE
+            near_metal = []
+            if metal is not None:
+                metal_lo, metal_hi = world_bounds([metal])
+                inside = np.all((lo <= metal_hi) & (metal_lo <= hi), axis=1)
+                near_metal = np.flatnonzero(inside & (np.array(kinds) == "Round")).tolist()
+        profile_count("pares_candidatos", len(pairs_i) + len(near_metal))
+
+        depsgraph = context.evaluated_depsgraph_get()
+        trees = {}
+
+        def tree(k):
+            bvh = trees.get(k)
+            if bvh is None:
+                bvh = trees[k] = mesh_cache.bvh_tree(objs[k], depsgraph)
+            return bvh
+
+        hits = []
+        with profile_phase("fase_estrecha"):
+            for i, j, same in zip(pairs_i.tolist(), pairs_j.tolist(), own.tolist()):
+                if not self._wanted(kinds[i], kinds[j]):
+                    continue
+                if same and {kinds[i], kinds[j]} == {"Round", "Prongs"}:
+                    continue
+                if tree(i).overlap(tree(j)):
+                    hits.append((i, j))
+            if near_metal:
+                # El metal va al final de la lista, con un solo árbol contra cada gema cercana
+                objs.append(metal)
+                kinds.append("Metal")
+                k_metal = len(objs) - 1
+                for i in near_metal:
+                    if tree(i).overlap(tree(k_metal)):
+                        hits.append((i, k_metal))
+        profile_count("bvh_usados", len(trees))
+
+        for obj in context.selected_objects:
+            obj.select_set(False)
+        involved = {k for pair in hits for k in pair}
+        for k in involved:
+            objs[k].select_set(True)
+
+        if not hits:
+            self.report({'INFO'}, f"Sin colisiones ({len(pairs_i)} pares revisados).")
+            return {'FINISHED'}
+
+        sample = ", ".join(f"{objs[i].name}/{objs[j].name}" for i, j in hits[:5])
+        more = f" y {len(hits) - 5} más" if len(hits) > 5 else ""
+        self.report({'WARNING'}, f"{len(hits)} colisión(es): {sample}{more}.")
+        return {'FINISHED'}
+
+
+#Asientos (un solo boolean con todos los cutters)
+
+SEAT_MODIFIER = "JT_Asientos"
+SEAT_CUTTER = "JT_CutterUnido"
+
+
+def _mesh_buffers(eval_obj):
+    """Vértices (local), tamaños de polígono y vértices por loop de la malla evaluada."""
+    mesh = eval_obj.to_mesh()
+    try:
+        co = _foreach_array(mesh.vertices, "co", 3).reshape(-1, 3).astype(np.float64)
+        totals = np.empty(len(mesh.polygons), dtype=np.int32)
+        mesh.polygons.foreach_get("loop_total", totals)
+        loops = np.empty(len(mesh.loops), dtype=np.int32)
+        mesh.loops.foreach_get("vertex_index", loops)
+    finally:
+        eval_obj.to_mesh_clear()
+    return co, totals, loops
+
+
+def _flip_loops(totals, loops):
+    """Invierte el orden de los loops de cada polígono (normales hacia fuera tras escala negativa)."""
+    starts = np.cumsum(totals) - totals
+    poly = np.repeat(np.arange(len(totals)), totals)
+    pos = np.arange(len(loops)) - starts[poly]
+    return loops[starts[poly] + totals[poly] - 1 - pos]
+
+
+def merge_cutters(pieces, depsgraph, space):
+    """
+    Une las mallas evaluadas de `pieces`, pares (objeto, matriz mundo), en una
+    sola, en el espacio local de `space`. Las mallas compartidas sin
+    modificadores (p. ej. los prototipos de una nube) se leen una sola vez.
+    """
+    inv = np.linalg.inv(np.array(space, dtype=np.float64))
+    cache = {}
+    cos, totals, loops = [], [], []
+    offset = 0
+    leidas = 0
+    for obj, matrix in pieces:
+        key = obj.data.name if not obj.modifiers else None
+        buffers = cache.get(key) if key else None
+        if buffers is None:
+            buffers = _mesh_buffers(obj.evaluated_get(depsgraph))
+            leidas += 1
+            if key:
+                cache[key] = buffers
+        co, tot, lp = buffers
+
+        mat = inv @ np.asarray(matrix, dtype=np.float64)
+        cos.append(co @ mat[:3, :3].T + mat[:3, 3])
+        totals.append(tot)
+        loops.append((_flip_loops(tot, lp) if np.linalg.det(mat[:3, :3]) < 0.0 else lp) + offset)
+        offset += len(co)
+    profile_count("mallas_leidas", leidas)
+
+    co = np.concatenate(cos) if cos else np.empty((0, 3))
+    totals = np.concatenate(totals) if totals else np.empty(0, dtype=np.int32)
+    loops = np.concatenate(loops) if loops else np.empty(0, dtype=np.int32)
+
+    mesh = bpy.data.meshes.new(SEAT_CUTTER)
+    mesh.vertices.add(len(co))
+    mesh.vertices.foreach_set("co", co.astype(np.float32).ravel())
+    mesh.loops.add(len(loops))
+    mesh.loops.foreach_set("vertex_index", loops)
+    mesh.polygons.add(len(totals))
+    mesh.polygons.foreach_set("loop_start", (np.cumsum(totals) - totals).astype(np.int32))
+    mesh.polygons.foreach_set("loop_total", totals)
+    mesh.update(calc_edges=True)
+    return mesh
+
+
+class OBJECT_OT_cut_seats(bpy.types.Operator):
+    """Une los Cutter seleccionados y los resta del objetivo con un único boolean"""
+    bl_idname = "object.cut_seats"
+    bl_label = "Cortar Asientos"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    solver: EnumProperty(
+        name="Solver",
+        items=[
+            ('EXACT', "Exacto", "Boolean exacto (lento, robusto)"),
+            ('FAST', "Rápido", "Boolean rápido (puede fallar con geometría no manifold)"),
+        ],
+        default='EXACT',
+    )
+    preview: BoolProperty(
+        name="Vista previa",
+        description="Deja el boolean como modificador sobre un cutter diezmado, sin aplicarlo",
+        default=False,
+    )
+    ratio: FloatProperty(
+        name="Diezmado",
+        description="Proporción de caras del cutter en la vista previa",
+        default=0.25, min=0.01, max=1.0,
+    )
+
+    def execute(self, context):
+        selected = [o for o in context.selected_objects if o.type == 'MESH']
+        cutters = [o for o in selected if o.name.startswith("Cutter") and INSTANCE_FAMILY_KEY not in o]
+        clouds = [o for o in selected if o.get(INSTANCE_FAMILY_KEY) == "Cutter"]
+        target = context.active_object
+        if target is None or target.name.startswith("Cutter") or target.type != 'MESH' or INSTANCE_FAMILY_KEY in target:
+            target = context.scene.snapz_props.target
+        if target is None or target.type != 'MESH':
+            self.report({'ERROR'}, "Activa la malla a cortar (o elígela como malla objetivo).")
+            return {'CANCELLED'}
+
+        # Los cutters instanciados entran uno por instancia, con su prototipo
+        pieces = [(o, o.matrix_world) for o in cutters]
+        broken = []
+        for cloud in clouds:
+            instances = instance_matrices(cloud)
+            if instances is None:
+                broken.append(cloud.name)
+                continue
+            protos, idx, mats = instances
+            pieces += [(protos[i], mat) for i, mat in zip(idx.tolist(), mats)]
+        if broken:
+            self.report({'WARNING'}, f"Nubes omitidas (sin modificador JT_Instancing): {', '.join(broken)}")
+        if not pieces:
+            self.report({'WARNING'}, "No hay Cutter seleccionados.")
+            return {'CANCELLED'}
+
+        # Quitar el resultado de una pasada anterior
+        old = target.modifiers.get(SEAT_MODIFIER)
+        if old is not None:
+            old_cutter = old.object
+            target.modifiers.remove(old)
+            if old_cutter is not None and old_cutter.name.startswith(SEAT_CUTTER):
+                old_mesh = old_cutter.data
+                bpy.data.objects.remove(old_cutter)
+                if not old_mesh.users:
+                    bpy.data.meshes.remove(old_mesh)
+
+        with profile_phase("union"):
+            mesh = merge_cutters(pieces, context.evaluated_depsgraph_get(), target.matrix_world)
+        merged = bpy.data.objects.new(SEAT_CUTTER, mesh)
+        merged.matrix_world = target.matrix_world
+        merged.display_type = 'WIRE'
+        merged.hide_render = True
+        target.users_collection[0].objects.link(merged)
+
+        if self.preview:
+            dec = merged.modifiers.new("JT_Diezmado", 'DECIMATE')
+            dec.ratio = self.ratio
+
+        mod = target.modifiers.new(SEAT_MODIFIER, 'BOOLEAN')
+        mod.operation = 'DIFFERENCE'
+        mod.object = merged
+        mod.solver = 'FAST' if self.preview else self.solver
+
+        if self.preview:
+            self.report({'INFO'}, f"Vista previa con {len(pieces)} cutter(s) ({len(mesh.polygons)} caras).")
+            return {'FINISHED'}
+
+        # Aplicarlo primero cortaría la malla base (la jaula de un Subdivision, antes
+        # del Bevel...): con otros modificadores el corte queda vivo al final de la pila
+        others = [m.name for m in target.modifiers if m != mod]
+        if others:
+            self.report({'WARNING'}, f"'{target.name}' tiene otros modificadores ({', '.join(others)}): "
+                                     f"el boolean queda sin aplicar al final de la pila.")
+            return {'FINISHED'}
+
+        # Con datos compartidos el modificador no se puede aplicar: el objetivo pasa a tener su copia
+        if target.data.users > 1:
+            target.data = target.data.copy()
+
+        with profile_phase("boolean"):
+            try:
+                with context.temp_override(object=target, active_object=target):
+                    result = bpy.ops.object.modifier_apply(modifier=mod.name)
+                error = None if 'FINISHED' in result else "el operador se canceló"
+            except RuntimeError as exc:
+                error = str(exc).strip()
+        if error:
+            target.modifiers.remove(mod)
+            bpy.data.objects.remove(merged)
+            bpy.data.meshes.remove(mesh)
+            self.report({'ERROR'}, f"No se pudo aplicar el boolean en '{target.name}': {error}")
+            return {'CANCELLED'}
+        bpy.data.objects.remove(merged)
+        bpy.data.meshes.remove(mesh)
+
+        self.report({'INFO'}, f"Asientos cortados en '{target.name}' con {len(pieces)} cutter(s).")
+        return {'FINISHED'}
+
+
+#Peso
+
+# Densidades de aleaciones en g/cm³
+ALLOY_DENSITIES = {
+    'GOLD_24K': ("Oro 24K", 19.32),
+    'GOLD_18K_YELLOW': ("Oro 18K amarillo", 15.53),
+    'GOLD_18K_WHITE': ("Oro 18K blanco", 14.64),
+    'GOLD_14K_YELLOW': ("Oro 14K amarillo", 13.05),
+    'GOLD_14K_WHITE': ("Oro 14K blanco", 12.61),
+    'GOLD_10K_YELLOW': ("Oro 10K amarillo", 11.57),
+    'SILVER_925': ("Plata 925", 10.36),
+    'PLATINUM_950': ("Platino 950", 20.7),
+    'PALLADIUM_950': ("Paladio 950", 12.16),
+}
+
+def _mesh_volume_local(eval_obj):
+    """Volumen (espacio local) como suma vectorizada de tetraedros con signo."""
+    co, tris = mesh_cache.local_mesh(eval_obj)
+    if not len(tris):
+        return 0.0
+    # Centrar reduce el error numérico en piezas lejos del origen
+    co = co.astype(np.float64)
+    co -= co.mean(axis=0)
+    v = co[tris]
+    return abs(np.einsum("ij,ij->", v[:, 0], np.cross(v[:, 1], v[:, 2])) / 6.0)
+
+
+def object_volume(obj, depsgraph):
+    """Volumen en espacio mundo del objeto evaluado (el volumen local queda en la cache compartida)."""
+    vol = mesh_cache.local_value("volume", obj, lambda: _mesh_volume_local(obj.evaluated_get(depsgraph)))
+    return vol * abs(obj.matrix_world.determinant())
+
+
+def instances_volume(cloud, depsgraph):
+    """Volumen de todas las instancias de una nube (prototipo × escala de cada punto); None si la nube está rota."""
+    instances = instance_matrices(cloud)
+    if instances is None:
+        return None
+    protos, idx, mats = instances
+    proto_vol = np.array([object_volume(p, depsgraph) for p in protos])
+    return float((proto_vol[idx] * np.abs(np.linalg.det(mats[:, :3, :3]))).sum())
+
+
+class OBJECT_OT_weight_jewelry(bpy.types.Operator):
+    """Calcula volumen y peso del metal de los objetos seleccionados"""
+    bl_idname = "object.weight_jewelry"
+    bl_label = "Calcular Peso"
+    bl_options = {'REGISTER'}
+
+    alloy: EnumProperty(
+        name="Aleación",
+        items=[(key, name, f"{density} g/cm³") for key, (name, density) in ALLOY_DENSITIES.items()],
+        default='GOLD_18K_YELLOW',
+    )
+    subtract_seats: BoolProperty(
+        name="Restar gemas/cutters",
+        description="Resta el volumen de los Round y Cutter seleccionados al del metal",
+        default=True,
+    )
+
+    def invoke(self, context, event):
+        # Sin UNDO no hay panel de rehacer: la aleación se elige en un diálogo
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context):
+        sel_objs = [o for o in context.selected_objects if o.type in {'MESH', 'CURVE'}]
+        if not sel_objs:
+            self.report({'WARNING'}, "No hay objetos seleccionados.")
+            return {'CANCELLED'}
+
+        depsgraph = context.evaluated_depsgraph_get()
+        metal = 0.0
+        seats = 0.0
+        broken = []
+        for obj in sel_objs:
+            if INSTANCE_FAMILY_KEY in obj:
+                vol = instances_volume(obj, depsgraph)
+                if vol is None:
+                    broken.append(obj.name)
+                    continue
+            else:
+                vol = object_volume(obj, depsgraph)
+            if obj.name.startswith(("Round", "Cutter")):
+                seats += vol
+            else:
+                metal += vol
+
+        if self.subtract_seats:
+            metal = max(metal - seats, 0.0)
+
+        # Unidades de escena -> mm³ -> cm³
+        mm = context.scene.unit_settings.scale_length * 1000.0
+        volume_mm3 = metal * mm ** 3
+        name, density = ALLOY_DENSITIES[self.alloy]
+        grams = volume_mm3 / 1000.0 * density
+
+        if broken:
+            self.report({'WARNING'}, f"Sin modificador JT_Instancing válido (no se contaron): {', '.join(broken)}")
+        self.report({'INFO'}, f"{name}: {grams:.2f} g ({volume_mm3:.2f} mm³)")
+        return {'FINISHED'}
+
+
+#Layout de gemas (.npy)
+
+# Registro por pieza; la categoría es el índice en INSTANCE_FAMILIES (255 = otra)
+LAYOUT_FIELDS = (
+    ("position", "<f4", (3,)),
+    ("rotation", "<f4", (3,)),
+    ("scale", "<f4", (3,)),
+    ("category", "u1"),
+)
+LAYOUT_OTHER = 255
+
+
+def _category(obj):
+    for i, family in enumerate(INSTANCE_FAMILIES):
+        if obj.name.startswith(family):
+            return i
+    return LAYOUT_OTHER
+
+
+def read_layout(filepath):
+    """Abre un layout memory-mapped (no se lee entero hasta que se usa)."""
+    layout = np.load(filepath, mmap_mode='r')
+    if layout.dtype != np.dtype(list(LAYOUT_FIELDS)):
+        raise ValueError("El archivo no es un layout de gemas")
+    return layout
+
+
+class OBJECT_OT_save_gem_layout(bpy.types.Operator, ExportHelper):
+    """Guarda posiciones, rotaciones, escalas y categoría de los objetos seleccionados"""
+    bl_idname = "object.save_gem_layout"
+    bl_label = "Guardar Layout"
+
+    filename_ext = ".npy"
+    filter_glob: StringProperty(default="*.npy", options={'HIDDEN'})
+
+    def execute(self, context):
+        sel_objs = sorted(
+            (o for o in context.selected_objects if INSTANCE_FAMILY_KEY not in o),
+            key=lambda o: o.name,
+        )
+        if not sel_objs:
+            self.report({'WARNING'}, "No hay objetos seleccionados.")
+            return {'CANCELLED'}
+
+        layout = np.zeros(len(sel_objs), dtype=list(LAYOUT_FIELDS))
+        for i, obj in enumerate(sel_objs):
+            loc, quat, scale = obj.matrix_world.decompose()
+            layout[i] = (loc[:], quat.to_euler('XYZ')[:], scale[:], _category(obj))
+
+        np.save(self.filepath, layout)
+        self.report({'INFO'}, f"Layout de {len(layout)} pieza(s) guardado en {self.filepath}")
+        return {'FINISHED'}
+
+
+class OBJECT_OT_load_gem_layout(bpy.types.Operator, ImportHelper):
+    """Aplica un layout guardado a los objetos seleccionados o crea las piezas"""
+    bl_idname = "object.load_gem_layout"
+    bl_label = "Cargar Layout"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    filename_ext = ".npy"
+    filter_glob: StringProperty(default="*.npy", options={'HIDDEN'})
+
+    mode: EnumProperty(
+        name="Modo",
+        items=[
+            ('SELECTED', "Seleccionados", "Mueve los objetos seleccionados (por categoría y nombre)"),
+            ('CREATE', "Crear", "Crea piezas enlazadas a la malla de un Round/Prongs/Cutter existente"),
+        ],
+        default='SELECTED',
+    )
+
+    def execute(self, context):
+        try:
+            layout = read_layout(self.filepath)
+        except (OSError, ValueError) as exc:
+            self.report({'ERROR'}, f"No se pudo leer el layout: {exc}")
+            return {'CANCELLED'}
+
+        mats = compose_matrices(layout["position"], layout["rotation"], layout["scale"])
+        categories = np.asarray(layout["category"])
+
+        placed = 0
+        skipped = 0
+        for cat in np.unique(categories).tolist():
+            rows = np.flatnonzero(categories == cat)
+
+            if self.mode == 'SELECTED':
+                objs = sorted(
+                    (o for o in context.selected_objects if _category(o) == cat and INSTANCE_FAMILY_KEY not in o),
+                    key=lambda o: o.name,
+                )
+            else:
+                if cat == LAYOUT_OTHER:
+                    skipped += len(rows)
+                    continue
+                family = INSTANCE_FAMILIES[cat]
+                source = next(iter(_family_objects(context.scene, family)), None)
+                if source is None:
+                    skipped += len(rows)
+                    continue
+                objs = [source.copy() for _ in rows]
+                for coll in source.users_collection:
+                    for obj in objs:
+                        coll.objects.link(obj)
+
+            skipped += max(len(rows) - len(objs), 0)
+            for obj, mat in zip(objs, mats[rows].tolist()):
+                obj.matrix_world = Matrix(mat)
+            placed += min(len(rows), len(objs))
+
+        if placed == 0:
+            self.report({'WARNING'}, "Ninguna pieza del layout coincide con la selección o la escena.")
+            return {'CANCELLED'}
+
+        msg = f"Layout aplicado a {placed} pieza(s)."
+        if skipped:
+            msg += f" {skipped} sin objeto correspondiente."
+        self.report({'INFO'}, msg)
+        return {'FINISHED'}
+
+
+#AplicarRotation y partsloose
+
+class OBJECT_OT_apply_rotation(bpy.types.Operator):
+    bl_idname = "object.apply_rotation_only"
+    bl_label = "Apply Rotation"
+    bl_description = "Aplica solo la rotación de los objetos seleccionados"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        for obj in context.selected_objects:
+            if obj.type == "MESH":
+                # Si comparte mesh, hacer copia (single user)
+                if obj.data.users > 1:
+                    obj.data = obj.data.copy()
+
+                # Obtener solo la parte de rotación de la matriz mundial
+                rot_matrix = obj.matrix_world.to_3x3().to_4x4()
+
+                # Aplicar la rotación a la geometría
+                obj.data.transform(rot_matrix)
+
+                # Mantener ubicación y escala
+                loc = obj.matrix_world.to_translation()
+                scale = obj.matrix_world.to_scale()
+
+                obj.matrix_world = (
+                    mathutils.Matrix.Translation(loc) @
+                    mathutils.Matrix.Diagonal((scale.x, scale.y, scale.z, 1.0))
+                )
+
+        return {'FINISHED'}
+
+
+class OBJECT_OT_separate_loose_parts(bpy.types.Operator):
+    bl_idname = "object.separate_loose_parts"
+    bl_label = "Separate Loose"
+    bl_description = "Divide la geometría seleccionada en partes separadas (By Loose Parts)"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        # Guardar objetos seleccionados
+        selected_objs = context.selected_objects
+
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+        for obj in selected_objs:
+            if obj.type == "MESH":
+                # Activar objeto
+                context.view_layer.objects.active = obj
+                obj.select_set(True)
+
+                # Entrar en modo edición y separar por Loose Parts
+                bpy.ops.object.mode_set(mode='EDIT')
+                bpy.ops.mesh.separate(type='LOOSE')
+                bpy.ops.object.mode_set(mode='OBJECT')
+
+        return {'FINISHED'}
+
+
+#RotarEnZ
+# Operador que reemplaza a transform.rotate cuando está activo
+class OBJECT_OT_rotate_parent_z(bpy.types.Operator):
+    bl_idname = "object.rotate_parent_z"
+    bl_label = "Rotate Parent Z"
+    bl_options = {'INTERNAL'}
+
+    def invoke(self, context, event):
+        if context.scene.parent_z_lock_enabled:
+            return bpy.ops.transform.rotate(
+                'INVOKE_DEFAULT',
+                orient_type='PARENT',
+                constraint_axis=(False, False, True)
+            )
+        else:
+            return bpy.ops.transform.rotate('INVOKE_DEFAULT')
+
+
+class OBJECT_OT_clear_measures(bpy.types.Operator):
+    bl_idname = "object.clear_measures"
+    bl_label = "Limpiar Medidas"
+    bl_description = "Elimina todas las Grease Pencil annotations (usadas para medidas)"
+    bl_options = {"REGISTER", "UNDO"}
+
+    def execute(self, context):
+        # Contador para feedback
+        count = 0
+
+        # Eliminar todos los Grease Pencil que sean annotations
+        for gp in list(bpy.data.grease_pencils):
+            if gp.is_annotation:
+                bpy.data.grease_pencils.remove(gp)
+                count += 1
+
+        self.report({'INFO'}, f"{count} medidas/anotaciones eliminadas")
+        return {'FINISHED'}
+
+
+
+# ------------------------------
+# Panel en N
+# ------------------------------
+
+
+
+# Panel principal (solo contenedor de pestañas)
+class VIEW3D_PT_jewelry_main(bpy.types.Panel):
+    bl_label = "Jewelry Tools"
+    bl_idname = "VIEW3D_PT_jewelry_main"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = 'Jewelry Tools'
+
+    def draw(self, context):
+        layout = self.layout
+        props = context.scene.snapz_props
+        scene = context.scene
+        wm = context.window_manager
+        scn = context.scene
+
+        col = layout.column(align=True)
+        col.prop(props, "target")
+        col.prop(props, "direction", text="Dirección")
+        col.prop(props, "align_rotation")
+        col.prop(props, "offset")
+        col.separator()
+        col.prop(props, "backtrack")
+        col.prop(props, "max_step")
+        col.operator("object.snap_in_z", icon='SNAP_NORMAL')
+        row = col.row(align=True)
+        row.prop(props, "live_link", toggle=True, icon='LINKED')
+        row.prop(props, "live_delay")
+
+
+
+
+
+
+class VIEW3D_PT_snapz_panel(bpy.types.Panel):
+    bl_label = "Jewelry Tools"
+    bl_idname = "VIEW3D_PT_snapz_panel"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = 'Jewelry Tools'
+
+    def draw(self, context):
+        layout = self.layout
+        props = context.scene.snapz_props
+        scene = context.scene
+        wm = context.window_manager
+        scn = context.scene
+
+        layout.label(text="Curvas", icon="CURVE_BEZCIRCLE")
+
+# --- Fila de botones: separar y convertir ---
+        row = layout.row(align=True)
+        row.operator("mesh.separar_loop_shrinkwrap_only", icon="MOD_SHRINKWRAP")
+        row.operator("object.convert_to_curve", icon="CURVE_DATA")
+
+ # --- Botón: distribuir en curva ---
+        col = layout.column(align=True)
+        col.operator("object.curve_distribute_gems", text="Distribuir en Curva", icon="CURVE_PATH")
+
+# --- Botón: aplicar y limpiar constraints ---
+
+        col.operator("object.apply_and_clear_constraints")
+        col.separator()
+
+# --- Zona Escala ---
+
+        row = layout.row(align=True)
+        row.operator("object.scale_z_minus", text=context.scene.scale_z_label, icon="IPO_CONSTANT")
+        row.operator("object.scale_z_equal_x",text="", icon="FILE_REFRESH")
+        
+        row = layout.row(align=True)
+        row.operator("object.move_z_up", text=f"Subir ({scene.z_up_count})", icon= "EXPORT")
+        row.operator("object.move_z_down", text=f" Bajar ({scene.z_down_count})", icon="IMPORT")
+        
+# --- JewelCreaft ---
+        layout.separator()
+        layout.label(text="JewelCraft", icon="EVENT_OS")
+
+        row = layout.row(align=True)
+        row.operator("object.mirror_jewelry",text="Mirror", icon="MOD_MIRROR")
+        row.operator("object.check_collisions", text="Colisiones", icon="UV_FACESEL")
+
+
+        layout.operator("object.select_all_jewelry", icon="GHOST_ENABLED")
+        row = layout.row(align=True)
+        row.operator("object.select_round", icon="KEYTYPE_EXTREME_VEC")
+        row.operator("object.select_prongs", icon="MESH_CAPSULE")
+        row.operator("object.select_cutter", icon="MESH_CYLINDER")
+        col.separator() 
+        
+        col = layout.column(align=True)
+        col.operator("object.jewelcraft_gem_add", text="Añadir Gema", icon="SEQ_CHROMA_SCOPE")
+
+        row = layout.row(align=True)
+        row.operator("object.add_prongs_batch", icon="MESH_CAPSULE")
+        row.operator("object.jewelcraft_cutter_add", icon="MESH_CYLINDER")
+        row.operator("object.cut_seats", icon="MOD_BOOLEAN")
+
+        row = layout.row(align=True)
+        row.operator("object.instance_jewelry", icon="OUTLINER_OB_POINTCLOUD")
+        row.operator("object.realize_jewelry", icon="MESH_DATA")
+
+        row = layout.row(align=True)
+        row.operator("object.save_gem_layout", icon="FILE_TICK")
+        row.operator("object.load_gem_layout", icon="FILE_FOLDER")
+
+        row = layout.row(align=True)
+        row.operator("object.apply_rotation_only",text="Apply-R", icon="FILE_REFRESH")
+        row.operator("object.separate_loose_parts",text="S-Loose", icon="MESH_CUBE")
+
+
+        col = layout.column(align=True)
+        col.operator("object.weight_jewelry", text="Calcular Peso",icon="WPAINT_HLT")
+
+        col = layout.column(align=True)
+        col.prop(wm.jewelcraft, "show_spacing", text="Mostrar Espaciado")
+        col.prop(scn.jewelcraft, "overlay_show_all", text="Mostrar Todo")
+        col.prop(scn.jewelcraft, "overlay_show_in_front", text="Mostrar Al Frente")
+
+        col = layout.column(align=True)
+        col.label(text="Proxy de visualización", icon="MOD_DECIM")
+        col.row(align=True).prop(scn, "proxy_mode", expand=True)
+        sub = col.row(align=True)
+        sub.active = scn.proxy_mode != 'OFF'
+        sub.prop(scn, "proxy_families", expand=True)
+
+        
+        layout = self.layout
+        layout.prop(context.scene, "face_project_enabled", text="Face Project", icon="SNAP_VOLUME", toggle=True)
+        layout.prop(context.scene, "parent_z_lock_enabled",icon="EVENT_Z", toggle=True)
+        layout = self.layout
+        layout.operator("object.clear_measures", icon="TRASH")
+        
+
+
+# ------------------------------
+# Registro
+# ------------------------------
+
+
+classes = (
+    SNAPZ_Props,
+    VIEW3D_PT_jewelry_main,
+    #MoverenZ
+    OBJECT_OT_move_z_up,
+    OBJECT_OT_move_z_down,
+    #MoverenZ
+    OBJECT_OT_snap_in_z,
+    OBJECT_OT_apply_and_clear_constraints,
+    OBJECT_OT_curve_distribute_gems,
+    VIEW3D_PT_snapz_panel,
+    #looptools
+    MESH_OT_separar_loop_shrinkwrap,
+    OBJECT_OT_convert_to_curve,
+    #menos1
+    OBJECT_OT_scale_z_minus, OBJECT_OT_scale_z_equal_x,
+    #SeleccionarRoundsProngsCutter
+    OBJECT_OT_select_round,
+    OBJECT_OT_select_prongs,
+    OBJECT_OT_select_cutter,
+    OBJECT_OT_select_all_jewelry,
+    OBJECT_OT_mirror_jewelry,
+    OBJECT_OT_add_prongs_batch,
+    OBJECT_OT_instance_jewelry,
+    OBJECT_OT_realize_jewelry,
+    OBJECT_OT_check_collisions,
+    OBJECT_OT_cut_seats,
+    OBJECT_OT_weight_jewelry,
+    OBJECT_OT_save_gem_layout,
+    OBJECT_OT_load_gem_layout,
+    OBJECT_OT_apply_rotation,
+    OBJECT_OT_separate_loose_parts,
+    OBJECT_OT_rotate_parent_z,
+    OBJECT_OT_clear_measures,
+)
+
+
+def scene_props():
+    """Todas las propiedades de escena del add-on (se definen solo aquí)."""
+    return {
+        "snapz_props": PointerProperty(type=SNAPZ_Props),
+        # menos1
+        "scale_z_label": StringProperty(name="Botón Z", default="Restar 0.1 en Z"),
+        # contadores de Mover en Z
+        "z_up_count": IntProperty(name="Subidas", default=0),
+        "z_down_count": IntProperty(name="Bajadas", default=0),
+        # face project
+        "face_project_enabled": BoolProperty(
+            name="Face Project",
+            description="Activar/Desactivar Snap Face Project",
+            default=False,
+            update=update_face_project,
+        ),
+        "parent_z_lock_enabled": BoolProperty(
+            name="Rotación Parent Z",
+            description="Fuerza la rotación en eje Z del Parent",
+            default=False,
+        ),
+        # proxy de visualización
+        "proxy_mode": EnumProperty(
+            name="Proxy",
+            description="Cómo se dibujan las familias en proxy (la selección y la exportación usan la malla completa)",
+            items=[
+                ('OFF', "Completo", "Geometría completa"),
+                ('BOUNDS', "Caja", "Solo la caja de cada objeto"),
+                ('OVERLAY', "Discos", "Caja más un disco por pieza dibujado en un solo lote"),
+            ],
+            default='OFF',
+            update=update_proxy_mode,
+        ),
+        "proxy_families": EnumProperty(
+            name="Familias",
+            items=[(name, name, "") for name in PROXY_COLORS],
+            default=set(PROXY_COLORS),
+            options={'ENUM_FLAG'},
+            update=update_proxy_mode,
+        ),
+    }
+
+
+# Handlers del add-on: (lista de bpy.app.handlers, función)
+handlers = (
+    ("depsgraph_update_post", live_snap_update),
+    ("depsgraph_update_post", proxy_update),
+    ("load_post", proxy_load_post),
+)
+
+# Atajos de teclado añadidos (para quitarlos exactamente al desregistrar)
+addon_keymaps = []
+
+# Tiempos de arranque en ms (import del módulo y register())
+startup_times = {"import_ms": 0.0, "register_ms": 0.0}
+
+
+def _registered_type(cls):
+    """Clase registrada con el mismo id (puede venir de una carga anterior del módulo)."""
+    idname = getattr(cls, "bl_idname", cls.__name__)
+    if issubclass(cls, bpy.types.Operator):
+        prefix, name = idname.split(".")
+        idname = f"{prefix.upper()}_OT_{name}"
+    return getattr(bpy.types, idname, None)
+
+
+def _remove_handlers():
+    # Compara por nombre: tras recargar el módulo las funciones son objetos nuevos
+    names = {h.__name__ for _, h in handlers}
+    for list_name in {list_name for list_name, _ in handlers}:
+        handler_list = getattr(bpy.app.handlers, list_name)
+        for handler in list(handler_list):
+            if getattr(handler, "__name__", None) in names and getattr(handler, "__module__", None) == __name__:
+                handler_list.remove(handler)
+
+
+# ===================
+#   REGISTRO GLOBAL
+# ===================
+def register():
+    start = time.perf_counter()
+
+    # Deja limpio cualquier resto de una carga anterior (recarga idempotente)
+    unregister()
+
+    for cls in classes:
+        bpy.utils.register_class(cls)
+
+    for name, prop in scene_props().items():
+        setattr(bpy.types.Scene, name, prop)
+
+    for list_name, handler in handlers:
+        getattr(bpy.app.handlers, list_name).append(handler)
+    mesh_cache.install(__name__)
+
+    # Redirigir la tecla R al nuevo operador
+    kc = bpy.context.window_manager.keyconfigs.addon
+    if kc:
+        km = kc.keymaps.new(name="3D View", space_type="VIEW_3D")
+        kmi = km.keymap_items.new("object.rotate_parent_z", type='R', value='PRESS')
+        addon_keymaps.append((km, kmi))
+
+    startup_times["register_ms"] = (time.perf_counter() - start) * 1000.0
+
+
+def unregister():
+    """Quita todo lo registrado; se puede llamar aunque el registro haya quedado a medias."""
+    for km, kmi in addon_keymaps:
+        try:
+            km.keymap_items.remove(kmi)
+        except (ReferenceError, RuntimeError):
+            pass
+    addon_keymaps.clear()
+
+    # Restos de versiones anteriores que no guardaban el atajo
+    kc = bpy.context.window_manager.keyconfigs.addon
+    km = kc.keymaps.get("3D View") if kc else None
+    if km:
+        for kmi in [k for k in km.keymap_items if k.idname == "object.rotate_parent_z"]:
+            km.keymap_items.remove(kmi)
+
+    _remove_handlers()
+    mesh_cache.uninstall(__name__)
+    if _proxy_state["draw_handle"] is not None:
+        bpy.types.SpaceView3D.draw_handler_remove(_proxy_state["draw_handle"], 'WINDOW')
+    _proxy_state.update(selected=None, batches=None, draw_handle=None, pending=set())
+    if bpy.app.timers.is_registered(_proxy_flush):
+        bpy.app.timers.unregister(_proxy_flush)
+    if bpy.app.timers.is_registered(_live_snap_flush):
+        bpy.app.timers.unregister(_live_snap_flush)
+    _live_state["pending"] = False
+    _curve_lut_cache.clear()
+
+    for name in scene_props():
+        if hasattr(bpy.types.Scene, name):
+            delattr(bpy.types.Scene, name)
+
+    for cls in reversed(classes):
+        registered = _registered_type(cls)
+        if registered is not None:
+            bpy.utils.unregister_class(registered)
+
+
+startup_times["import_ms"] = (time.perf_counter() - _import_start) * 1000.0
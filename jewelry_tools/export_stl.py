@@ -0,0 +1,863 @@
+import bpy
+import json
+import os
+import queue
+import re
+import struct
+import threading
+import time
+import zipfile
+
+import numpy as np
+
+from . import jewelry_cache as mesh_cache
+from .jewelry_profiler import count as profile_count, phase as profile_phase
+from .jewelry_relax import pares_en_rejilla
+
+# --- Propiedades ---
+class ExportSTLProps(bpy.types.PropertyGroup):
+    export_path: bpy.props.StringProperty(
+        name="Carpeta de exportación",
+        subtype="DIR_PATH",
+        default="//stl_exports/"
+    )
+    formato: bpy.props.EnumProperty(
+        name="Formato",
+        items=[
+            ('STL', "STL", "STL binario (un archivo por grupo)"),
+            ('PLY', "PLY", "PLY binario indexado (vértices compartidos)"),
+            ('3MF', "3MF", "3MF con una malla indexada por objeto"),
+        ],
+        default='STL',
+    )
+    streaming: bpy.props.BoolProperty(
+        name="Streaming (poca memoria)",
+        description="Escribe los triángulos objeto por objeto directamente al archivo, sin unir ni duplicar mallas",
+        default=False,
+    )
+    validar: bpy.props.BoolProperty(
+        name="Validar mallas",
+        description="Revisa caras degeneradas, aristas abiertas o no-manifold y normales invertidas antes de exportar",
+        default=False,
+    )
+    reparar: bpy.props.BoolProperty(
+        name="Reparar",
+        description="Suelda vértices cercanos, quita caras degeneradas y voltea piezas cerradas con normales invertidas (solo en el archivo exportado)",
+        default=False,
+    )
+    tolerancia: bpy.props.FloatProperty(
+        name="Tolerancia de soldado",
+        default=0.0001,
+        min=0.0, max=1.0,
+        precision=5,
+    )
+
+# Propiedad con la que Jewelry Tools marca las nubes de instancias
+INSTANCE_FAMILY_KEY = "jt_instance_family"
+
+
+def _realize_node_group():
+    """Node group que realiza las instancias (para exportar nubes de Jewelry Tools)."""
+    ng = bpy.data.node_groups.get("JT_Realize")
+    if ng is None:
+        ng = bpy.data.node_groups.new("JT_Realize", 'GeometryNodeTree')
+        if hasattr(ng, "interface"):
+            ng.interface.new_socket("Geometry", in_out='INPUT', socket_type='NodeSocketGeometry')
+            ng.interface.new_socket("Geometry", in_out='OUTPUT', socket_type='NodeSocketGeometry')
+        else:
+            ng.inputs.new('NodeSocketGeometry', "Geometry")
+            ng.outputs.new('NodeSocketGeometry', "Geometry")
+        n_in = ng.nodes.new('NodeGroupInput')
+        n_out = ng.nodes.new('NodeGroupOutput')
+        n_real = ng.nodes.new('GeometryNodeRealizeInstances')
+        ng.links.new(n_in.outputs[0], n_real.inputs[0])
+        ng.links.new(n_real.outputs[0], n_out.inputs[0])
+    return ng
+
+
+# --- Función auxiliar: obtener malla desde mesh o curva ---
+def collect_mesh_objects(objs):
+    """Devuelve una lista de objetos malla. Convierte curvas e instancias temporalmente a mesh."""
+    mesh_objs = []
+    temp_objs = []
+
+    for obj in objs:
+        if obj.type == "MESH" and INSTANCE_FAMILY_KEY in obj:
+            # Nube de instancias: copia con las instancias realizadas
+            dup = obj.copy()
+            dup.data = obj.data.copy()
+            dup.modifiers.new("JT_Realize", 'NODES').node_group = _realize_node_group()
+            bpy.context.collection.objects.link(dup)
+            bpy.context.view_layer.objects.active = dup
+            bpy.ops.object.select_all(action='DESELECT')
+            dup.select_set(True)
+            bpy.ops.object.convert(target='MESH')
+            mesh_objs.append(dup)
+            temp_objs.append(dup)
+        elif obj.type == "MESH":
+            mesh_objs.append(obj)
+        elif obj.type == "CURVE":
+            # Malla temporal en mundo de la curva evaluada (se borra junto con el objeto temporal)
+            co, tris = mesh_cache.world_triangles(obj, bpy.context.evaluated_depsgraph_get(), store=False)
+            dup = bpy.data.objects.new(obj.name, malla_temporal(obj.name, co, tris))
+            bpy.context.collection.objects.link(dup)
+            mesh_objs.append(dup)
+            temp_objs.append(dup)
+
+    return mesh_objs, temp_objs
+
+
+def malla_temporal(nombre, co, tris):
+    """Malla nueva de solo triángulos a partir de los arrays (V, 3) y (T, 3)."""
+    mesh = bpy.data.meshes.new(nombre)
+    mesh.vertices.add(len(co))
+    mesh.vertices.foreach_set("co", co.astype(np.float32).ravel())
+    mesh.loops.add(tris.size)
+    mesh.loops.foreach_set("vertex_index", tris.astype(np.int32).ravel())
+    mesh.polygons.add(len(tris))
+    mesh.polygons.foreach_set("loop_start", np.arange(0, tris.size, 3, dtype=np.int32))
+    mesh.polygons.foreach_set("loop_total", np.full(len(tris), 3, dtype=np.int32))
+    mesh.update(calc_edges=True)
+    return mesh
+
+# --- Grupos de exportación ---
+def grupos_exportacion(view_layer):
+    """Prongs, Cutter y grupos numéricos por nombre base -> lista de objetos."""
+    grupos = {
+        "Prongs": [obj for obj in view_layer.objects if obj.name.startswith("Prongs")],
+        "Cutter": [obj for obj in view_layer.objects if obj.name.startswith("Cutter")],
+    }
+    grupos = {nombre: objetos for nombre, objetos in grupos.items() if objetos}
+
+    regex_num = re.compile(r"^\d")
+    for obj in view_layer.objects:
+        if regex_num.match(obj.name):
+            base_name = obj.name.split(".")[0]
+            grupos.setdefault(base_name, []).append(obj)
+
+    return grupos
+
+
+# --- Extracción de geometría ---
+def malla_mundo(co, tris, matrix):
+    """Aplica la matriz a los vértices (invierte el orden de los triángulos si la escala es negativa)."""
+    m = np.array(matrix, dtype=np.float32)
+    co = co @ m[:3, :3].T + m[:3, 3]
+    if np.linalg.det(m[:3, :3]) < 0:
+        tris = tris[:, ::-1]
+    return co, tris
+
+
+def instancias_de(cloud, depsgraph):
+    """(prototipo original, matriz mundo) de cada instancia de una nube de Jewelry Tools."""
+    instancias = []
+    for inst in depsgraph.object_instances:
+        if inst.is_instance and inst.parent and inst.parent.original == cloud:
+            instancias.append((inst.object.original, inst.matrix_world.copy()))
+    return instancias
+
+
+def piezas(objetos, depsgraph):
+    """
+    Recorre (nombre, vértices mundo, triángulos) objeto por objeto; solo hay
+    una malla evaluada en memoria a la vez (más la de cada prototipo de
+    instancias). Reutiliza los triángulos que ya estén en la cache compartida
+    pero no guarda los que faltan: cada pieza se suelta en cuanto se escribe.
+    """
+    for obj in objetos:
+        if INSTANCE_FAMILY_KEY in obj:
+            prototipos = {}
+            for n, (proto, matrix) in enumerate(instancias_de(obj, depsgraph)):
+                if proto.name not in prototipos:
+                    prototipos[proto.name] = mesh_cache.local_mesh(proto.evaluated_get(depsgraph))
+                yield (f"{obj.name}_{n:04d}", *malla_mundo(*prototipos[proto.name], matrix))
+        elif obj.type in {"MESH", "CURVE"}:
+            co, tris = mesh_cache.world_triangles(obj, depsgraph, store=False)
+            yield obj.name, co.astype(np.float32), tris
+
+
+def unir_vertices(co, tris):
+    """Quita vértices con coordenadas idénticas y reindexa los triángulos."""
+    co, inversa = np.unique(co, axis=0, return_inverse=True)
+    return co, inversa.reshape(-1)[tris]
+
+
+def sin_degeneradas(tris):
+    """Quita los triángulos que quedaron con un vértice repetido (área cero) al unir vértices."""
+    repetidos = (tris[:, 0] == tris[:, 1]) | (tris[:, 1] == tris[:, 2]) | (tris[:, 0] == tris[:, 2])
+    return tris[~repetidos] if repetidos.any() else tris
+
+
+# --- Validación ---
+def soldar_vertices(co, tris, tolerancia):
+    """
+    Une vértices a menos de `tolerancia` entre sí (y en cadena). La rejilla
+    tiene celdas de `tolerancia`, así que cada vértice se compara con los de
+    su celda y las 26 vecinas: los que quedan a ambos lados de un borde
+    también se sueldan.
+    """
+    co, tris = unir_vertices(co, tris)
+    if tolerancia <= 0 or len(co) < 2:
+        return co, tris
+    i, j = pares_en_rejilla(np.floor(co / tolerancia).astype(np.int64))
+    cerca = ((co[j] - co[i]).astype(np.float64) ** 2).sum(axis=1) <= tolerancia * tolerancia
+    i, j = i[cerca], j[cerca]
+    if not len(i):
+        return co, tris
+
+    # Cada grupo de vértices cercanos termina con la etiqueta de su índice más bajo
+    etiqueta = np.arange(len(co))
+    while True:
+        menor = np.minimum(etiqueta[i], etiqueta[j])
+        nueva = etiqueta.copy()
+        np.minimum.at(nueva, i, menor)
+        np.minimum.at(nueva, j, menor)
+        nueva = nueva[nueva]
+        if np.array_equal(nueva, etiqueta):
+            break
+        etiqueta = nueva
+    representantes, inversa = np.unique(etiqueta, return_inverse=True)
+    return co[representantes], inversa.reshape(-1)[tris]
+
+
+def analizar_malla(co, tris, tolerancia):
+    """
+    Revisa una pieza ya soldada. Devuelve (reporte, vértices, triángulos válidos)
+    donde los triángulos válidos ya no tienen caras degeneradas.
+    """
+    co, tris = soldar_vertices(co, tris, tolerancia)
+    a, b, c = co[tris[:, 0]], co[tris[:, 1]], co[tris[:, 2]]
+    area2 = np.linalg.norm(np.cross(b - a, c - a), axis=1)
+    repetidos = (tris[:, 0] == tris[:, 1]) | (tris[:, 1] == tris[:, 2]) | (tris[:, 0] == tris[:, 2])
+    degeneradas = repetidos | (area2 <= max(tolerancia, 1e-12) ** 2)
+    validos = tris[~degeneradas]
+
+    # Histograma de aristas ordenadas (claves enteras a*V + b)
+    n = np.int64(len(co))
+    dirigidas = np.stack((validos, np.roll(validos, -1, axis=1)), axis=2).reshape(-1, 2).astype(np.int64)
+    _, conteo = np.unique(np.sort(dirigidas, axis=1) @ np.array([n, 1]), return_counts=True)
+    _, conteo_dir = np.unique(dirigidas @ np.array([n, 1]), return_counts=True)
+
+    abiertas = int((conteo == 1).sum())
+    v = co[validos].astype(np.float64)
+    volumen = np.einsum("ij,ij->", v[:, 0], np.cross(v[:, 1], v[:, 2])) / 6.0
+
+    reporte = {
+        "triangulos": int(len(tris)),
+        "degeneradas": int(degeneradas.sum()),
+        "aristas_abiertas": abiertas,
+        "aristas_no_manifold": int((conteo > 2).sum()),
+        # Una arista recorrida dos veces en el mismo sentido = caras vecinas con orden opuesto
+        "aristas_orden_inconsistente": int((conteo_dir > 1).sum()),
+        "normales_invertidas": bool(abiertas == 0 and volumen < 0),
+    }
+    return reporte, co, validos
+
+
+def validar_piezas(fuente, reporte_grupo, reparar, tolerancia):
+    """
+    Envuelve una fuente de piezas: acumula el análisis de cada una en
+    `reporte_grupo` y, si `reparar`, entrega la versión soldada y limpia.
+    """
+    for nombre, co, tris in fuente:
+        reporte, co_limpio, tris_limpios = analizar_malla(co, tris, tolerancia)
+        for clave, valor in reporte.items():
+            reporte_grupo[clave] = reporte_grupo.get(clave, 0) + int(valor)
+        if reporte["degeneradas"] or reporte["aristas_abiertas"] or reporte["aristas_no_manifold"] \
+                or reporte["aristas_orden_inconsistente"] or reporte["normales_invertidas"]:
+            reporte_grupo.setdefault("piezas_con_problemas", []).append(nombre)
+        if reparar:
+            if reporte["normales_invertidas"]:
+                tris_limpios = tris_limpios[:, ::-1]
+            yield nombre, co_limpio, tris_limpios
+        else:
+            yield nombre, co, tris
+
+
+def resumen_validacion(reporte):
+    problemas = []
+    for clave, texto in (
+        ("degeneradas", "caras degeneradas"),
+        ("aristas_abiertas", "aristas abiertas"),
+        ("aristas_no_manifold", "aristas no-manifold"),
+        ("aristas_orden_inconsistente", "aristas con orden inconsistente"),
+        ("normales_invertidas", "piezas con normales invertidas"),
+    ):
+        if reporte.get(clave):
+            problemas.append(f"{reporte[clave]} {texto}")
+    return ", ".join(problemas)
+
+
+# --- Streaming STL ---
+STL_TRIANGULO = np.dtype([
+    ("normal", "<f4", (3,)),
+    ("vertices", "<f4", (3, 3)),
+    ("attr", "<u2"),
+])
+
+
+def escribir_triangulos(f, tris):
+    """Escribe triángulos (T, 3, 3) en mundo como registros STL binarios. Devuelve cuántos."""
+    normales = np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0])
+    largo = np.linalg.norm(normales, axis=1, keepdims=True)
+    largo[largo == 0] = 1.0
+    registros = np.zeros(len(tris), dtype=STL_TRIANGULO)
+    registros["normal"] = normales / largo
+    registros["vertices"] = tris
+    f.write(registros.tobytes())
+    return len(tris)
+
+
+def exportar_stl_streaming(filepath, fuente, encabezado=b"Export STL Simplificado"):
+    """STL binario escrito por partes (de `fuente`): cuenta provisional y se corrige al final."""
+    total = 0
+    with open(filepath, "wb") as f:
+        f.write(encabezado[:80].ljust(80, b" "))
+        f.write(struct.pack("<I", 0))
+        for _, co, tris in fuente:
+            total += escribir_triangulos(f, co[tris])
+        f.seek(80)
+        f.write(struct.pack("<I", total))
+    return total
+
+
+# --- PLY ---
+PLY_CARA = np.dtype([("n", "u1"), ("v", "<i4", (3,))])
+
+
+def exportar_ply(filepath, fuente):
+    """PLY binario de todo el grupo con vértices compartidos. Devuelve (vértices, triángulos)."""
+    todos_co, todos_tris = [], []
+    base = 0
+    for _, co, tris in fuente:
+        co, tris = unir_vertices(co, tris)
+        tris = sin_degeneradas(tris)
+        todos_co.append(co)
+        todos_tris.append(tris + base)
+        base += len(co)
+
+    co = np.concatenate(todos_co) if todos_co else np.empty((0, 3), dtype=np.float32)
+    tris = np.concatenate(todos_tris) if todos_tris else np.empty((0, 3), dtype=np.int32)
+    caras = np.empty(len(tris), dtype=PLY_CARA)
+    caras["n"] = 3
+    caras["v"] = tris
+
+    encabezado = (
+        "ply\n"
+        "format binary_little_endian 1.0\n"
+        "comment Export STL Simplificado\n"
+        f"element vertex {len(co)}\n"
+        "property float x\nproperty float y\nproperty float z\n"
+        f"element face {len(tris)}\n"
+        "property list uchar int vertex_indices\n"
+        "end_header\n"
+    )
+    with open(filepath, "wb") as f:
+        f.write(encabezado.encode("ascii"))
+        f.write(co.astype("<f4").tobytes())
+        f.write(caras.tobytes())
+    return len(co), len(tris)
+
+
+# --- 3MF ---
+_3MF_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="model" ContentType="application/vnd.ms-package.3dmanufacturing-3dmodel+xml"/>'
+    '</Types>'
+)
+_3MF_RELS = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Target="/3D/3dmodel.model" Id="rel0" '
+    'Type="http://schemas.microsoft.com/3dmanufacturing/2013/01/3dmodel"/>'
+    '</Relationships>'
+)
+
+
+def _xml_atributo(texto):
+    return (texto.replace("&", "&amp;").replace('"', "&quot;")
+            .replace("<", "&lt;").replace(">", "&gt;"))
+
+
+# Unidades de 3MF y cuántos metros mide cada una
+_3MF_UNIDADES = (
+    ("micron", 1e-6),
+    ("millimeter", 1e-3),
+    ("centimeter", 1e-2),
+    ("inch", 0.0254),
+    ("foot", 0.3048),
+    ("meter", 1.0),
+)
+
+
+def unidad_3mf(escala):
+    """
+    (unidad, factor) para una escena cuya unidad mide `escala` metros
+    (unit_settings.scale_length). Si ninguna unidad de 3MF coincide se
+    escriben milímetros y las coordenadas se multiplican por el factor.
+    """
+    for unidad, metros in _3MF_UNIDADES:
+        if abs(escala - metros) <= metros * 1e-6:
+            return unidad, 1.0
+    return "millimeter", escala * 1000.0
+
+
+def exportar_3mf(filepath, fuente, escala=1.0):
+    """
+    3MF (zip) con una malla indexada por objeto, escrita objeto por objeto.
+    `escala` son los metros por unidad de la escena. Devuelve (objetos, triángulos).
+    """
+    unidad, factor = unidad_3mf(escala)
+    total_tris = 0
+    ids = []
+    with zipfile.ZipFile(filepath, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", _3MF_CONTENT_TYPES)
+        zf.writestr("_rels/.rels", _3MF_RELS)
+        with zf.open("3D/3dmodel.model", "w") as f:
+            f.write(
+                b'<?xml version="1.0" encoding="UTF-8"?>\n'
+                + f'<model unit="{unidad}" xml:lang="es" '.encode("ascii")
+                + b'xmlns="http://schemas.microsoft.com/3dmanufacturing/core/2015/02">\n<resources>\n'
+            )
+            for nombre, co, tris in fuente:
+                co, tris = unir_vertices(co, tris)
+                tris = sin_degeneradas(tris)
+                if not len(tris):
+                    continue
+                if factor != 1.0:
+                    co = co * factor
+                obj_id = len(ids) + 1
+                ids.append(obj_id)
+                f.write(f'<object id="{obj_id}" type="model" name="{_xml_atributo(nombre)}">'
+                        '<mesh>\n<vertices>\n'.encode("utf-8"))
+                np.savetxt(f, co, fmt='<vertex x="%.6f" y="%.6f" z="%.6f"/>')
+                f.write(b"</vertices>\n<triangles>\n")
+                np.savetxt(f, tris, fmt='<triangle v1="%d" v2="%d" v3="%d"/>')
+                f.write(b"</triangles>\n</mesh></object>\n")
+                total_tris += len(tris)
+            f.write(b"</resources>\n<build>\n")
+            f.write("".join(f'<item objectid="{i}"/>' for i in ids).encode("ascii"))
+            f.write(b"\n</build>\n</model>\n")
+    return len(ids), total_tris
+
+
+# --- Escritura por formato ---
+EXTENSIONES = {'STL': "stl", 'PLY': "ply", '3MF': "3mf"}
+
+
+def escribir_grupo(formato, filepath, fuente, escala=1.0):
+    """
+    Escribe un grupo con el escritor propio del formato; devuelve el detalle
+    para el reporte. `escala` (metros por unidad) solo la usa 3MF, que guarda la unidad.
+    """
+    if formato == 'PLY':
+        verts, tris = exportar_ply(filepath, fuente)
+        return f"{verts} vértices, {tris} triángulos"
+    if formato == '3MF':
+        objetos, tris = exportar_3mf(filepath, fuente, escala)
+        return f"{objetos} objeto(s), {tris} triángulos"
+    return f"{exportar_stl_streaming(filepath, fuente)} triángulos"
+
+
+# --- Exportación en segundo plano ---
+# Segundos de extracción por cada tick del operador modal (la interfaz sigue respondiendo)
+TIEMPO_POR_TICK = 0.03
+
+class ExportacionCancelada(Exception):
+    pass
+
+
+def _cancelable(fuente, evento):
+    """Corta la escritura en cuanto se pide cancelar (se revisa pieza por pieza)."""
+    for pieza in fuente:
+        if evento.is_set():
+            raise ExportacionCancelada
+        yield pieza
+
+
+class EscritorSegundoPlano(threading.Thread):
+    """
+    Hilo que escribe los grupos que le entrega el operador modal pieza por
+    pieza por una cola acotada: ("grupo", nombre, filepath), luego
+    ("pieza", pieza) por cada objeto y ("fin",) al cerrar el grupo. Así en
+    memoria solo hay unas pocas piezas a la vez. Cada archivo se escribe como
+    '.part' y se renombra al terminar, así cancelar nunca deja archivos a medias.
+    """
+
+    def __init__(self, formato, validar, reparar, tolerancia, escala=1.0, tamano_cola=8):
+        super().__init__(daemon=True)
+        self.formato = formato
+        self.escala = escala
+        self.validar = validar
+        self.reparar = reparar
+        self.tolerancia = tolerancia
+        self.cola = queue.Queue(maxsize=tamano_cola)
+        self.cancelado = threading.Event()
+        self.terminados = []  # (nombre, filepath, detalle)
+        self.validacion = {}
+        self.error = None
+
+    def _piezas_del_grupo(self):
+        """Piezas del grupo en curso a medida que llegan, hasta su marca de fin."""
+        while True:
+            trabajo = self.cola.get()
+            if trabajo is None:
+                raise ExportacionCancelada
+            if trabajo[0] == "fin":
+                return
+            yield trabajo[1]
+
+    def run(self):
+        while True:
+            trabajo = self.cola.get()
+            if trabajo is None or self.cancelado.is_set():
+                return
+            _, nombre, filepath = trabajo
+            temporal = filepath + ".part"
+            fuente = _cancelable(self._piezas_del_grupo(), self.cancelado)
+            if self.validar:
+                fuente = validar_piezas(fuente, self.validacion.setdefault(nombre, {}), self.reparar, self.tolerancia)
+            try:
+                detalle = escribir_grupo(self.formato, temporal, fuente, self.escala)
+                os.replace(temporal, filepath)
+            except ExportacionCancelada:
+                _borrar(temporal)
+                return
+            except Exception as exc:
+                _borrar(temporal)
+                self.error = f"{nombre}: {exc}"
+                return
+            self.terminados.append((nombre, filepath, detalle))
+
+    def cancelar(self):
+        self.cancelado.set()
+        while True:
+            try:
+                self.cola.get_nowait()
+            except queue.Empty:
+                break
+        self.cola.put(None)
+        self.join()
+
+
+def _borrar(filepath):
+    if os.path.exists(filepath):
+        os.remove(filepath)
+
+
+# --- Operador Exportar ---
+class EXPORTSTL_OT_export(bpy.types.Operator):
+    bl_idname = "exportstl.export"
+    bl_label = "Exportar STL"
+    bl_description = "Exporta Prongs, Cutter, objetos numéricos y curvas con geometría agrupando por nombre base"
+
+    def invoke(self, context, event):
+        """Desde la interfaz la exportación corre en segundo plano (modal, cancelable con Esc)."""
+        props = context.scene.export_stl_props
+        self._folder = bpy.path.abspath(props.export_path)
+        os.makedirs(self._folder, exist_ok=True)
+
+        bpy.ops.object.hide_view_clear()
+        self._pendientes = list(grupos_exportacion(context.view_layer).items())
+        if not self._pendientes:
+            self.report({'WARNING'}, "No hay nada que exportar.")
+            return {'CANCELLED'}
+        self._total = len(self._pendientes)
+        self._fuente = None  # piezas del grupo que se está extrayendo
+        self._cola_cerrada = False
+
+        # En segundo plano siempre se usa el escritor propio (bpy.ops no puede salir del hilo principal)
+        self._escritor = EscritorSegundoPlano(
+            props.formato, props.validar, props.reparar, props.tolerancia,
+            escala=context.scene.unit_settings.scale_length,
+        )
+        self._escritor.start()
+
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(0.05, window=context.window)
+        wm.modal_handler_add(self)
+        wm.progress_begin(0, self._total)
+        self._estado(context)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            self._escritor.cancelar()
+            self._terminar(context)
+            hechos = len(self._escritor.terminados)
+            self.report({'WARNING'}, f"Exportación cancelada ({hechos} de {self._total} grupo(s) completos).")
+            return {'CANCELLED'}
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+
+        escritor = self._escritor
+        if escritor.error:
+            return self._fallo(context, escritor.error)
+
+        # Piezas sueltas mientras el hilo tenga sitio en la cola y quede tiempo en este tick
+        limite = time.perf_counter() + TIEMPO_POR_TICK
+        while not self._cola_cerrada and not escritor.cola.full() and time.perf_counter() < limite:
+            if self._fuente is None:
+                if not self._pendientes:
+                    escritor.cola.put_nowait(None)
+                    self._cola_cerrada = True
+                    break
+                nombre, objetos = self._pendientes.pop(0)
+                filepath = os.path.join(self._folder, f"{nombre}.{EXTENSIONES[escritor.formato]}")
+                self._grupo = nombre
+                self._fuente = piezas(objetos, context.evaluated_depsgraph_get())
+                escritor.cola.put_nowait(("grupo", nombre, filepath))
+                continue
+            try:
+                with profile_phase("extraccion"):
+                    pieza = next(self._fuente, None)
+            except ReferenceError:
+                escritor.cancelar()
+                return self._fallo(context, f"se borraron objetos de '{self._grupo}' durante la exportación.")
+            if pieza is None:
+                self._fuente = None
+                escritor.cola.put_nowait(("fin",))
+            else:
+                escritor.cola.put_nowait(("pieza", pieza))
+
+        self._estado(context)
+        if escritor.is_alive():
+            return {'PASS_THROUGH'}
+
+        # El hilo pudo terminar por un error después de la última revisión
+        if escritor.error:
+            return self._fallo(context, escritor.error)
+        self._terminar(context)
+        for nombre, filepath, detalle in escritor.terminados:
+            profile_count("archivos_escritos")
+            self.report({'INFO'}, f"{nombre} exportado a {filepath} ({detalle})")
+        self._reportar_validacion(escritor.validacion, self._folder)
+        return {'FINISHED'}
+
+    def _fallo(self, context, mensaje):
+        self._terminar(context)
+        self.report({'ERROR'}, f"Error al exportar {mensaje}")
+        return {'CANCELLED'}
+
+    def _estado(self, context):
+        hechos = len(self._escritor.terminados)
+        context.window_manager.progress_update(hechos)
+        context.workspace.status_text_set(
+            f"Exportando {hechos}/{self._total} grupo(s) · {self._total - len(self._pendientes)} extraídos · Esc para cancelar"
+        )
+
+    def _terminar(self, context):
+        wm = context.window_manager
+        wm.event_timer_remove(self._timer)
+        wm.progress_end()
+        context.workspace.status_text_set(None)
+
+    def execute(self, context):
+        props = context.scene.export_stl_props
+        export_folder = bpy.path.abspath(props.export_path)
+
+        if not os.path.exists(export_folder):
+            os.makedirs(export_folder)
+
+        bpy.ops.object.hide_view_clear()
+
+        grupos = grupos_exportacion(context.view_layer)
+        depsgraph = context.evaluated_depsgraph_get()
+        validacion = {}
+
+        def fuente(nombre, objetos):
+            """Piezas del grupo, pasando por la validación si está activa."""
+            origen = piezas(objetos, depsgraph)
+            if not props.validar:
+                return origen
+            return validar_piezas(origen, validacion.setdefault(nombre, {}), props.reparar, props.tolerancia)
+
+        # La validación y la reparación trabajan sobre los buffers que escribimos nosotros:
+        # así cada grupo se extrae una sola vez y se valida mientras se escribe
+        streaming = props.streaming or props.validar
+
+        if props.formato in {'PLY', '3MF'} or streaming:
+            for nombre, objetos in grupos.items():
+                filepath = os.path.join(export_folder, f"{nombre}.{EXTENSIONES[props.formato]}")
+                with profile_phase(props.formato.lower() if props.formato != 'STL' else "streaming"):
+                    detalle = escribir_grupo(props.formato, filepath, fuente(nombre, objetos),
+                                             context.scene.unit_settings.scale_length)
+                profile_count("archivos_escritos")
+                self.report({'INFO'}, f"{nombre} exportado a {filepath} ({detalle})")
+            self._reportar_validacion(validacion, export_folder)
+            return {'FINISHED'}
+
+        temp_to_delete = []
+
+        for nombre, objetos in grupos.items():
+            bpy.ops.object.select_all(action='DESELECT')
+            with profile_phase("extraccion"):
+                mesh_objs, temps = collect_mesh_objects(objetos)
+            temp_to_delete.extend(temps)
+
+            for obj in mesh_objs:
+                obj.select_set(True)
+            context.view_layer.objects.active = mesh_objs[0]
+
+            filepath = os.path.join(export_folder, f"{nombre}.stl")
+            with profile_phase("bpy.ops"):
+                bpy.ops.export_mesh.stl(filepath=filepath, use_selection=True, ascii=False, use_mesh_modifiers=True)
+            profile_count("archivos_escritos")
+            self.report({'INFO'}, f"{nombre} exportado a {filepath}")
+
+        bpy.ops.object.select_all(action='DESELECT')
+        temp_meshes = [obj.data for obj in temp_to_delete]
+        for obj in temp_to_delete:
+            obj.select_set(True)
+        bpy.ops.object.delete()
+        for mesh in temp_meshes:
+            if not mesh.users:
+                bpy.data.meshes.remove(mesh)
+
+        return {'FINISHED'}
+
+    def _reportar_validacion(self, validacion, export_folder):
+        """Avisa por grupo y guarda el reporte completo junto a los archivos."""
+        if not validacion:
+            return
+        for nombre, reporte in validacion.items():
+            resumen = resumen_validacion(reporte)
+            if resumen:
+                self.report({'WARNING'}, f"{nombre}: {resumen}")
+        filepath = os.path.join(export_folder, "validacion.json")
+        with open(filepath, "w", encoding="utf-8") as f:
+            json.dump(validacion, f, indent=2, ensure_ascii=False)
+        self.report({'INFO'}, f"Reporte de validación en {filepath}")
+
+
+# --- Operador Renombrar ---
+def orden_natural(nombre):
+    """Clave de orden natural: '2-Anillo' va antes que '10-Anillo'."""
+    return [int(t) if t.isdigit() else t.lower() for t in re.split(r"(\d+)", nombre)]
+
+
+def planear_nombres(cantidad, base_number, name_suffix):
+    """Nombres finales '<número>-<sufijo><001...>' para `cantidad` objetos."""
+    return [f"{base_number + i}-{name_suffix}{(i + 1):03d}" for i in range(cantidad)]
+
+
+def renombrar_en_dos_fases(objs, nombres):
+    """
+    Primero da a todos un nombre temporal único y después el final, así
+    ningún nombre final choca con otro objeto de la misma selección.
+    """
+    ocupados = set(bpy.data.objects.keys())
+    prefijo = "__renombrar"
+    while any(n.startswith(prefijo) for n in ocupados):
+        prefijo += "_"
+    for i, obj in enumerate(objs):
+        obj.name = f"{prefijo}{i}"
+    for obj, nombre in zip(objs, nombres):
+        obj.name = nombre
+
+
+class EXPORTSTL_OT_rename(bpy.types.Operator):
+    bl_idname = "exportstl.rename_objects"
+    bl_label = "Renombrar seleccionados"
+    bl_description = "Renombra los objetos seleccionados incrementando el número inicial y agregando un sufijo secuencial (001, 002, 003...)"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    orden: bpy.props.EnumProperty(
+        name="Orden",
+        items=[
+            ('ALPHA', "Alfabético", "Orden de texto simple (el de siempre)"),
+            ('NATURAL', "Natural", "Los números dentro del nombre se comparan como números (2 antes que 10)"),
+        ],
+        default='ALPHA',
+    )
+
+    def execute(self, context):
+        selected_objs = context.selected_objects
+
+        if not selected_objs:
+            self.report({'WARNING'}, "No hay objetos seleccionados.")
+            return {'CANCELLED'}
+
+        # Ordenamos por nombre para consistencia
+        if self.orden == 'ALPHA':
+            selected_objs.sort(key=lambda o: o.name)
+        else:
+            selected_objs.sort(key=lambda o: orden_natural(o.name))
+
+        # Detectar número inicial del primer objeto (antes del guion)
+        match = re.match(r"^(\d+)-(.+)$", selected_objs[0].name)
+        if not match:
+            self.report({'ERROR'}, "El nombre no tiene formato '##-Nombre'")
+            return {'CANCELLED'}
+
+        base_number = int(match.group(1))
+        name_suffix = match.group(2).split(".")[0]  # Ej: Cube
+
+        # Todos los nombres se planean antes de tocar nada
+        nuevos = planear_nombres(len(selected_objs), base_number, name_suffix)
+        seleccion = {obj.name for obj in selected_objs}
+        ocupados = set(bpy.data.objects.keys()) - seleccion
+        choques = [n for n in nuevos if n in ocupados]
+        if choques:
+            muestra = ", ".join(choques[:5])
+            self.report({'ERROR'}, f"{len(choques)} nombre(s) ya existen fuera de la selección: {muestra}")
+            return {'CANCELLED'}
+
+        with profile_phase("escritura"):
+            renombrar_en_dos_fases(selected_objs, nuevos)
+        profile_count("objetos_escritos", len(selected_objs))
+
+        self.report({'INFO'}, f"Renombrados {len(selected_objs)} objetos correctamente.")
+        return {'FINISHED'}
+
+
+# --- UI ---
+class EXPORTSTL_PT_panel(bpy.types.Panel):
+    bl_label = "Export STL Simplificado"
+    bl_idname = "EXPORTSTL_PT_panel"
+    bl_space_type = "VIEW_3D"
+    bl_region_type = "UI"
+    bl_category = "Export STL"
+
+    def draw(self, context):
+        layout = self.layout
+        props = context.scene.export_stl_props
+        layout.separator()
+        layout.operator("exportstl.rename_objects", icon="SORTALPHA")
+        layout.separator()
+        
+        layout.prop(props, "export_path")
+        layout.prop(props, "formato")
+        if props.formato == 'STL':
+            layout.prop(props, "streaming")
+        row = layout.row(align=True)
+        row.prop(props, "validar", toggle=True)
+        sub = row.row(align=True)
+        sub.active = props.validar
+        sub.prop(props, "reparar", toggle=True)
+        if props.validar:
+            layout.prop(props, "tolerancia")
+        layout.separator()
+        layout.operator("exportstl.export", icon="EXPORT")
+
+
+
+# --- Registro ---
+classes = [
+    ExportSTLProps,
+    EXPORTSTL_OT_export,
+    EXPORTSTL_OT_rename,
+    EXPORTSTL_PT_panel,
+]
+
+def register():
+    for cls in classes:
+        bpy.utils.register_class(cls)
+    bpy.types.Scene.export_stl_props = bpy.props.PointerProperty(type=ExportSTLProps)
+
+def unregister():
+    for cls in reversed(classes):
+        bpy.utils.unregister_class(cls)
+    del bpy.types.Scene.export_stl_props
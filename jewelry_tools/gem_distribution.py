@@ -0,0 +1,381 @@
+import bpy
+import math
+import numpy as np
+from mathutils import Matrix
+
+from .jewelry_profiler import count as profile_count, phase as profile_phase
+from .jewelry_relax import relajar, relajar_en_paralelo
+
+
+# Rango de separación (mm) con escala X = 1.0 y cuánto se desplaza por cada 0.1 de escala
+RANGO_SEPARACION = (1.156, 1.204)
+PASO_POR_ESCALA = 0.100
+
+
+def rango_por_escala(scale_x):
+    """Devuelve rango min/max de separación según escala X (también acepta un array de escalas)"""
+    factor = np.round((np.asarray(scale_x, dtype=np.float64) - 1.0) * 10)  # -1 si 0.9, 0 si 1.0, +1 si 1.1
+    min_val = RANGO_SEPARACION[0] + factor * PASO_POR_ESCALA
+    max_val = RANGO_SEPARACION[1] + factor * PASO_POR_ESCALA
+    return min_val, max_val
+
+
+def calcular_distancia(scale_x, slider_val):
+    """Convierte el valor del slider (0–1) en mm reales según escala"""
+    min_val, max_val = rango_por_escala(scale_x)
+    return min_val + (max_val - min_val) * slider_val
+
+
+def distancias_por_escala(escalas_x, slider_val):
+    """Versión vectorizada de calcular_distancia para un array de escalas X."""
+    return calcular_distancia(np.asarray(escalas_x, dtype=np.float64), slider_val)
+
+
+# Puntos por bloque en las pruebas vectorizadas (limita la memoria N x segmentos)
+BLOQUE_PUNTOS = 512
+
+
+def segmentos_contorno(obj, depsgraph):
+    """
+    Segmentos (mundo) del contorno: bordes de las caras seleccionadas de una malla
+    (o de todas si no hay selección), o las aristas de una curva cerrada.
+    Devuelve un array (S, 2, 3); vacío si el contorno tiene extremos sueltos.
+    """
+    if obj.type == 'MESH':
+        obj.update_from_editmode()
+        eval_obj = obj
+        mesh = obj.data
+    else:
+        eval_obj = obj.evaluated_get(depsgraph)
+        mesh = eval_obj.to_mesh()
+
+    try:
+        co = np.empty(len(mesh.vertices) * 3, dtype=np.float64)
+        mesh.vertices.foreach_get("co", co)
+        co = co.reshape(-1, 3)
+        aristas = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+        mesh.edges.foreach_get("vertices", aristas)
+        aristas = aristas.reshape(-1, 2)
+
+        if len(mesh.polygons):
+            seleccion = np.empty(len(mesh.polygons), dtype=bool)
+            mesh.polygons.foreach_get("select", seleccion)
+            if not seleccion.any():
+                seleccion[:] = True
+            totales = np.empty(len(mesh.polygons), dtype=np.int32)
+            mesh.polygons.foreach_get("loop_total", totales)
+            loop_aristas = np.empty(len(mesh.loops), dtype=np.int32)
+            mesh.loops.foreach_get("edge_index", loop_aristas)
+
+            # Aristas usadas por una sola cara seleccionada = borde
+            usadas = loop_aristas[np.repeat(seleccion, totales)]
+            conteo = np.bincount(usadas, minlength=len(aristas))
+            aristas = aristas[conteo == 1]
+    finally:
+        if eval_obj is not obj:
+            eval_obj.to_mesh_clear()
+
+    # Un vértice con un número impar de aristas de borde es un extremo abierto
+    grado = np.bincount(aristas.ravel(), minlength=len(co))
+    if not len(aristas) or (grado % 2).any():
+        return np.empty((0, 2, 3))
+
+    mat = np.array(obj.matrix_world)
+    co = co @ mat[:3, :3].T + mat[:3, 3]
+    return co[aristas]
+
+
+def marco_plano(puntos):
+    """Origen y ejes (u, v, normal) del plano que mejor ajusta a los puntos."""
+    origen = puntos.mean(axis=0)
+    u, v = np.linalg.svd(puntos - origen, full_matrices=False)[2][:2]
+    n = np.cross(u, v)
+    if n[2] < 0:
+        n = -n
+        v = -v
+    return origen, u, v, n
+
+
+def _dentro_poligono(p, a, b):
+    """Regla par-impar vectorizada: p (N, 2) contra segmentos a-b (S, 2)."""
+    ay, by = a[None, :, 1], b[None, :, 1]
+    py = p[:, None, 1]
+    cruza = (ay > py) != (by > py)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_corte = a[None, :, 0] + (py - ay) * (b[None, :, 0] - a[None, :, 0]) / (by - ay)
+    return ((cruza & (p[:, None, 0] < x_corte)).sum(axis=1) % 2) == 1
+
+
+def _distancia_segmentos(p, a, b):
+    """Distancia mínima de cada punto p (N, 2) a los segmentos a-b (S, 2)."""
+    ab = b - a
+    largo2 = np.maximum((ab * ab).sum(axis=1), 1e-18)
+    ap = p[:, None, :] - a[None, :, :]
+    t = np.clip((ap * ab[None]).sum(axis=2) / largo2, 0.0, 1.0)
+    cercano = a[None] + t[..., None] * ab[None]
+    return np.sqrt(((p[:, None, :] - cercano) ** 2).sum(axis=2)).min(axis=1)
+
+
+def puntos_dentro(p, a, b, margen):
+    """Máscara de puntos dentro del contorno y a al menos `margen` de su borde."""
+    mascara = np.zeros(len(p), dtype=bool)
+    for i in range(0, len(p), BLOQUE_PUNTOS):
+        bloque = p[i:i + BLOQUE_PUNTOS]
+        dentro = _dentro_poligono(bloque, a, b)
+        if margen > 0 and dentro.any():
+            dentro[dentro] = _distancia_segmentos(bloque[dentro], a, b) >= margen
+        mascara[i:i + BLOQUE_PUNTOS] = dentro
+    return mascara
+
+
+def red_hexagonal(minimo, maximo, distancia):
+    """Puntos 2D del panal (mismo patrón que Distribuir Panal) cubriendo la caja dada."""
+    paso_y = distancia * math.sqrt(3) / 2
+    filas = np.arange(math.floor(minimo[1] / paso_y), math.ceil(maximo[1] / paso_y) + 1)
+    cols = np.arange(math.floor(minimo[0] / distancia) - 1, math.ceil(maximo[0] / distancia) + 1)
+    fila, col = np.meshgrid(filas, cols, indexing="ij")
+    x = col * distancia + np.where(fila % 2, distancia / 2, 0.0)
+    y = fila * paso_y
+    return np.column_stack((x.ravel(), y.ravel()))
+
+
+class OBJECT_OT_distribuir_gemas_panal_centro(bpy.types.Operator):
+    bl_idname = "object.distribuir_gemas_panal_centro"
+    bl_label = "Distribuir Panal (Centro Activo)"
+    bl_description = "Distribuye las gemas en patrón de panal tomando el objeto activo como centro"
+    bl_options = {"REGISTER", "UNDO"}
+    
+    def execute(self, context):
+        seleccionados = context.selected_objects
+        activo = context.active_object
+        
+        if not seleccionados or not activo:
+            self.report({"WARNING"}, "Debes tener objetos seleccionados y un activo")
+            return {"CANCELLED"}
+        
+        # calcular distancia real en mm según slider y escala (la mayor si hay tamaños mezclados)
+        slider_val = context.scene.gema_spacing_slider
+        escalas = [obj.scale.x for obj in seleccionados]
+        distancia = float(distancias_por_escala(escalas, slider_val).max())
+        
+        # parámetros panal
+        offset_x = distancia / 2
+        offset_y = distancia * math.sqrt(3) / 2
+        
+        # referencia: el activo es el centro
+        x_base, y_base, z_base = activo.location
+        
+        # quitamos el activo de la lista
+        otros = [obj for obj in seleccionados if obj != activo]
+        
+        # estimamos tamaño del bloque hexagonal
+        total = len(seleccionados)
+        filas = int(math.ceil(math.sqrt(total)))
+        
+        idx = 0
+        for fila in range(-filas//2, filas//2 + 1):
+            for col in range(-filas//2, filas//2 + 1):
+                if idx >= len(otros):
+                    break
+                
+                if fila == 0 and col == 0:  # saltar el centro
+                    continue
+                
+                x = x_base + col * distancia + (offset_x if fila % 2 else 0)
+                y = y_base + fila * offset_y
+                z = z_base
+                
+                otros[idx].location = (x, y, z)
+                idx += 1
+
+        profile_count("objetos_escritos", idx)
+        self.report({"INFO"}, f"Usando distancia: {distancia:.3f} mm")
+        return {"FINISHED"}
+
+
+class OBJECT_OT_reacomodar_gemas(bpy.types.Operator):
+    bl_idname = "object.reacomodar_gemas"
+    bl_label = "Reacomodar Gemas"
+    bl_description = "Ajusta las gemas en X e Y (local) acercando o separando hasta aproximarlas a la distancia mínima"
+    bl_options = {"REGISTER", "UNDO"}
+
+    iteraciones: bpy.props.IntProperty(
+        name="Iteraciones",
+        default=10,
+        min=1, max=1000,
+    )
+    paralelo: bpy.props.BoolProperty(
+        name="Paralelo",
+        description="Reparte la relajación en tiles entre varios procesos (solo con muchas gemas; arrancar los procesos tarda)",
+        default=False,
+    )
+    procesos: bpy.props.IntProperty(
+        name="Procesos",
+        description="Procesos a usar (0 = todos los núcleos)",
+        default=0,
+        min=0, max=256,
+    )
+
+    def execute(self, context):
+        seleccionados = context.selected_objects
+        activo = context.active_object
+
+        if not seleccionados or not activo:
+            self.report({"WARNING"}, "Debes tener objetos seleccionados y un activo")
+            return {"CANCELLED"}
+
+        # distancia objetivo de cada gema según slider y su propia escala
+        slider_val = context.scene.gema_spacing_slider
+        distancias = distancias_por_escala([obj.scale.x for obj in seleccionados], slider_val)
+
+        pos = np.array([obj.location[:2] for obj in seleccionados], dtype=np.float64)
+        with profile_phase("relajacion"):
+            if self.paralelo:
+                relajar_en_paralelo(pos, distancias, self.iteraciones, self.procesos or None)
+            else:
+                relajar(pos, distancias, self.iteraciones)
+
+        with profile_phase("escritura"):
+            for obj, (x, y) in zip(seleccionados, pos.tolist()):
+                obj.location.x = x
+                obj.location.y = y
+        profile_count("objetos_escritos", len(seleccionados))
+
+        if distancias.min() == distancias.max():
+            self.report({"INFO"}, f"Gemas reacomodadas hacia {distancias[0]:.3f} mm")
+        else:
+            self.report({"INFO"}, f"Gemas reacomodadas ({distancias.min():.3f}–{distancias.max():.3f} mm por tamaño)")
+        return {"FINISHED"}
+
+
+class OBJECT_OT_distribuir_gemas_en_contorno(bpy.types.Operator):
+    bl_idname = "object.distribuir_gemas_en_contorno"
+    bl_label = "Rellenar Contorno (Panal)"
+    bl_description = "Rellena con gemas en panal el contorno activo (curva cerrada o caras seleccionadas), creando solo las gemas que caben"
+    bl_options = {"REGISTER", "UNDO"}
+
+    margen: bpy.props.FloatProperty(
+        name="Margen",
+        description="Separación extra entre el borde de la gema y el contorno",
+        default=0.0,
+        min=0.0, max=100.0,
+        step=1, precision=3,
+    )
+
+    def execute(self, context):
+        contorno = context.active_object
+        gemas = sorted((o for o in context.selected_objects if o != contorno), key=lambda o: o.name)
+
+        if not contorno or contorno.type not in {'MESH', 'CURVE'} or not gemas:
+            self.report({"WARNING"}, "Selecciona una gema y después el contorno (curva o malla) como activo")
+            return {"CANCELLED"}
+
+        if contorno.type == 'CURVE':
+            abiertas = sum(1 for spline in contorno.data.splines if not spline.use_cyclic_u)
+            if abiertas:
+                self.report({"WARNING"}, f"La curva tiene {abiertas} spline(s) abiertos; ciérralos (Alt+C) antes de rellenar")
+                return {"CANCELLED"}
+
+        depsgraph = context.evaluated_depsgraph_get()
+        with profile_phase("contorno"):
+            segmentos = segmentos_contorno(contorno, depsgraph)
+        if len(segmentos) < 3:
+            self.report({"WARNING"}, "El contorno no está cerrado")
+            return {"CANCELLED"}
+
+        modelo = gemas[0]
+        escalas = [obj.scale.x for obj in gemas]
+        distancia = float(distancias_por_escala(escalas, context.scene.gema_spacing_slider).max())
+
+        # Contorno en coordenadas del plano
+        origen, u, v, n = marco_plano(segmentos.reshape(-1, 3))
+        plano = np.stack((u, v), axis=1)
+        a = (segmentos[:, 0] - origen) @ plano
+        b = (segmentos[:, 1] - origen) @ plano
+
+        with profile_phase("red"):
+            puntos = red_hexagonal(np.minimum(a, b).min(axis=0), np.maximum(a, b).max(axis=0), distancia)
+            radio = modelo.dimensions.x / 2
+            puntos = puntos[puntos_dentro(puntos, a, b, radio + self.margen)]
+
+        if not len(puntos):
+            self.report({"WARNING"}, "No cabe ninguna gema dentro del contorno")
+            return {"CANCELLED"}
+
+        # Reusar las gemas seleccionadas y crear solo las que faltan
+        while len(gemas) < len(puntos):
+            copia = modelo.copy()
+            for coll in modelo.users_collection:
+                coll.objects.link(copia)
+            gemas.append(copia)
+
+        # Z de las gemas a la normal del plano, conservando su escala
+        base = np.identity(4)
+        base[:3, 0], base[:3, 1], base[:3, 2] = np.cross(v, n), v, n
+        posiciones = origen + puntos @ plano.T
+        with profile_phase("escritura"):
+            for obj, pos in zip(gemas, posiciones.tolist()):
+                mat = Matrix(base.tolist())
+                mat.translation = pos
+                obj.matrix_world = mat @ Matrix.Diagonal(obj.scale.to_4d())
+        profile_count("objetos_escritos", len(puntos))
+
+        sobrantes = len(gemas) - len(puntos)
+        msg = f"{len(puntos)} gema(s) dentro de '{contorno.name}' a {distancia:.3f} mm"
+        if sobrantes > 0:
+            msg += f" ({sobrantes} seleccionada(s) sin usar)"
+        self.report({"INFO"}, msg)
+        return {"FINISHED"}
+
+
+class VIEW3D_PT_distribuir_gemas_panel(bpy.types.Panel):
+    bl_label = "Distribuir Gemas"
+    bl_idname = "VIEW3D_PT_distribuir_gemas_panel"
+    bl_space_type = "VIEW_3D"
+    bl_region_type = "UI"
+    bl_category = "Joyería"
+    
+    def draw(self, context):
+        layout = self.layout
+        activo = context.active_object
+
+        if activo:
+            min_val, max_val = rango_por_escala(activo.scale.x)
+            slider_val = context.scene.gema_spacing_slider
+            distancia_real = calcular_distancia(activo.scale.x, slider_val)
+            
+            layout.label(text=f"Escala X: {activo.scale.x:.2f}")
+            layout.prop(context.scene, "gema_spacing_slider", slider=True, text="Distancia (0–1)")
+            layout.label(text=f"Distancia real: {distancia_real:.3f} mm")
+            layout.label(text=f"Rango válido: {min_val:.3f} mm - {max_val:.3f} mm")
+        else:
+            layout.label(text="Selecciona un objeto activo")
+        
+        layout.operator("object.distribuir_gemas_panal_centro")
+        layout.operator("object.reacomodar_gemas")
+        layout.operator("object.distribuir_gemas_en_contorno")
+
+
+def register():
+    bpy.utils.register_class(OBJECT_OT_distribuir_gemas_panal_centro)
+    bpy.utils.register_class(OBJECT_OT_reacomodar_gemas)
+    bpy.utils.register_class(OBJECT_OT_distribuir_gemas_en_contorno)
+    bpy.utils.register_class(VIEW3D_PT_distribuir_gemas_panel)
+    
+    bpy.types.Scene.gema_spacing_slider = bpy.props.FloatProperty(
+        name="Distancia (0–1)",
+        description="Valor normalizado para calcular la separación",
+        default=0.0,  # empieza en el mínimo
+        min=0.0,
+        max=1.0,
+        step=0.01,
+        precision=3
+    )
+
+
+def unregister():
+    bpy.utils.unregister_class(OBJECT_OT_distribuir_gemas_panal_centro)
+    bpy.utils.unregister_class(OBJECT_OT_reacomodar_gemas)
+    bpy.utils.unregister_class(OBJECT_OT_distribuir_gemas_en_contorno)
+    bpy.utils.unregister_class(VIEW3D_PT_distribuir_gemas_panel)
+    del bpy.types.Scene.gema_spacing_slider
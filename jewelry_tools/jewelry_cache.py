@@ -0,0 +1,271 @@
+"""
+Cache compartida de geometría evaluada para Jewelry Tools.
+
+Guarda por objeto arrays y valores derivados de su malla evaluada
+(triángulos en mundo, BVHTree, volumen). Nunca guarda datablocks: todo se
+copia a arrays y la malla evaluada se libera enseguida. La clave combina el
+nombre del objeto y de sus datos, un contador de generación que suben los
+updates de geometría del depsgraph y, si hace falta, un digest de la matriz
+mundo. Las entradas menos usadas se descartan al pasar el límite de memoria;
+deshacer, rehacer y abrir un archivo vacían la cache.
+
+NumPy y BVHTree se importan al usarse, así importar el módulo no los carga.
+"""
+
+from collections import OrderedDict, defaultdict
+
+import bpy
+
+# Límite de memoria por defecto (bytes aproximados)
+MAX_BYTES = 256 * 1024 * 1024
+
+_entries = OrderedDict()         # clave -> (valor, bytes)
+_generation = defaultdict(int)   # nombre de objeto o ("data", nombre) -> generación
+_stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+_size = {"bytes": 0, "limit": MAX_BYTES}
+_users = set()
+_previous = {}                   # nombre de objeto -> (co, tris) de la última lectura seguida
+
+
+# ------------------------------
+# Claves
+# ------------------------------
+
+def matrix_digest(matrix):
+    """Digest barato de una matriz 4x4."""
+    return hash(tuple(v for row in matrix for v in row))
+
+
+def _key(kind, obj, with_matrix=True):
+    data_name = obj.data.name if obj.data is not None else ""
+    return (
+        kind,
+        obj.name,
+        data_name,
+        _generation[obj.name],
+        _generation[("data", data_name)],
+        matrix_digest(obj.matrix_world) if with_matrix else None,
+    )
+
+
+# ------------------------------
+# LRU
+# ------------------------------
+
+def get(key):
+    entry = _entries.get(key)
+    if entry is None:
+        _stats["misses"] += 1
+        return None
+    _entries.move_to_end(key)
+    _stats["hits"] += 1
+    return entry[0]
+
+
+def put(key, value, nbytes):
+    old = _entries.pop(key, None)
+    if old is not None:
+        _size["bytes"] -= old[1]
+    _entries[key] = (value, nbytes)
+    _size["bytes"] += nbytes
+    while _size["bytes"] > _size["limit"] and len(_entries) > 1:
+        _, (_, old_bytes) = _entries.popitem(last=False)
+        _size["bytes"] -= old_bytes
+        _stats["evictions"] += 1
+    return value
+
+
+def set_limit(nbytes):
+    """Cambia el límite de memoria (descarta lo que sobre en la siguiente inserción)."""
+    _size["limit"] = nbytes
+
+
+def clear():
+    _entries.clear()
+    _size["bytes"] = 0
+    _generation.clear()
+    _previous.clear()
+
+
+def stats():
+    """Aciertos, fallos, descartes, entradas y memoria usada."""
+    total = _stats["hits"] + _stats["misses"]
+    return {
+        **_stats,
+        "hit_rate": _stats["hits"] / total if total else 0.0,
+        "entries": len(_entries),
+        "bytes": _size["bytes"],
+        "limit": _size["limit"],
+    }
+
+
+# ------------------------------
+# Geometría
+# ------------------------------
+
+def local_mesh(eval_obj):
+    """
+    Vértices (V, 3) en espacio local y triángulos (T, 3) de un objeto
+    evaluado (malla, curva...), sin pasar por la cache. La malla temporal se
+    libera antes de volver.
+    """
+    import numpy as np
+
+    mesh = eval_obj.to_mesh()
+    try:
+        mesh.calc_loop_triangles()
+        co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", co)
+        tris = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+        mesh.loop_triangles.foreach_get("vertices", tris)
+    finally:
+        eval_obj.to_mesh_clear()
+    return co.reshape(-1, 3), tris.reshape(-1, 3)
+
+
+def world_mesh(obj, depsgraph):
+    """
+    Vértices (V, 3) en mundo y triángulos (T, 3) del objeto evaluado, sin
+    pasar por la cache. Con escala negativa se invierte el orden de los
+    triángulos para que las normales sigan apuntando hacia fuera.
+    """
+    import numpy as np
+
+    eval_obj = obj.evaluated_get(depsgraph)
+    co, tris = local_mesh(eval_obj)
+    m = np.array(eval_obj.matrix_world, dtype=np.float64)
+    co = co @ m[:3, :3].T + m[:3, 3]
+    if np.linalg.det(m[:3, :3]) < 0:
+        tris = tris[:, ::-1]
+    return co, tris
+
+
+def world_triangles(obj, depsgraph, store=True):
+    """
+    Como `world_mesh`, pero cacheado. Con `store=False` solo se reutiliza una
+    entrada que ya exista: lo que falta se calcula sin guardarlo, para que un
+    recorrido de toda la escena (la exportación) no desplace lo que usan los
+    operadores. Los arrays no se deben modificar.
+    """
+    key = _key("tris", obj)
+    value = get(key)
+    if value is None:
+        co, tris = world_mesh(obj, depsgraph)
+        if not store:
+            return co, tris
+        co.flags.writeable = False
+        tris.flags.writeable = False
+        value = put(key, (co, tris), co.nbytes + tris.nbytes)
+    return value
+
+
+def tracked_triangles(obj, depsgraph):
+    """
+    (anterior, actual): `world_triangles` del objeto y lo que devolvió la
+    llamada anterior a esta función (None la primera vez), para saber qué
+    zona cambió. Solo se guarda la última lectura de cada objeto seguido.
+    """
+    current = world_triangles(obj, depsgraph)
+    previous = _previous.get(obj.name)
+    _previous[obj.name] = current
+    return previous, current
+
+
+def untrack(name=None):
+    """Deja de seguir un objeto (o todos)."""
+    if name is None:
+        _previous.clear()
+    else:
+        _previous.pop(name, None)
+
+
+def bvh_tree(obj, depsgraph):
+    """BVHTree en mundo del objeto evaluado (cacheado)."""
+    from mathutils.bvhtree import BVHTree
+
+    key = _key("bvh", obj)
+    tree = get(key)
+    if tree is None:
+        co, tris = world_triangles(obj, depsgraph)
+        tree = BVHTree.FromPolygons(co.tolist(), tris.tolist(), all_triangles=True)
+        # Estimación: el árbol ocupa del orden de los propios triángulos
+        tree = put(key, tree, co.nbytes + tris.nbytes * 2)
+    return tree
+
+
+def local_value(kind, obj, compute, nbytes=64):
+    """
+    Valor derivado de la geometría evaluada de `obj` que no depende de su
+    matriz (p. ej. el volumen local). `compute()` se llama solo si falta.
+    """
+    key = _key(kind, obj, with_matrix=False)
+    value = get(key)
+    if value is None:
+        value = put(key, compute(), nbytes)
+    return value
+
+
+# ------------------------------
+# Invalidación
+# ------------------------------
+
+@bpy.app.handlers.persistent
+def cache_depsgraph_update(scene, depsgraph):
+    """Sube la generación de lo que cambió de geometría: sus claves dejan de coincidir."""
+    changed = 0
+    for update in depsgraph.updates:
+        if not update.is_updated_geometry:
+            continue
+        data = update.id.original
+        if isinstance(data, bpy.types.Object):
+            _generation[data.name] += 1
+        else:
+            _generation[("data", data.name)] += 1
+        changed += 1
+    _stats["invalidations"] += changed
+    if changed and _entries:
+        _drop_stale()
+
+
+def _drop_stale():
+    """Descarta las entradas cuya generación ya no es la actual."""
+    for key in [k for k in _entries if k[3] != _generation[k[1]] or k[4] != _generation[("data", k[2])]]:
+        _, nbytes = _entries.pop(key)
+        _size["bytes"] -= nbytes
+
+
+@bpy.app.handlers.persistent
+def cache_reset(*args):
+    """
+    Al abrir un archivo, deshacer o rehacer, los datos pueden volver a un
+    estado que no pasa por depsgraph_update_post: nada de lo guardado sigue siendo válido.
+    """
+    clear()
+
+
+_HANDLERS = (
+    (bpy.app.handlers.depsgraph_update_post, cache_depsgraph_update),
+    (bpy.app.handlers.load_pre, cache_reset),
+    (bpy.app.handlers.load_post, cache_reset),
+    (bpy.app.handlers.undo_post, cache_reset),
+    (bpy.app.handlers.redo_post, cache_reset),
+)
+
+
+def install(user):
+    """Cada add-on que usa la cache la instala al registrarse (los handlers se añaden una sola vez)."""
+    _users.add(user)
+    for handler_list, handler in _HANDLERS:
+        if handler not in handler_list:
+            handler_list.append(handler)
+
+
+def uninstall(user):
+    """Quita los handlers cuando el último add-on que la usa se desregistra."""
+    _users.discard(user)
+    if _users:
+        return
+    for handler_list, handler in _HANDLERS:
+        if handler in handler_list:
+            handler_list.remove(handler)
+    clear()
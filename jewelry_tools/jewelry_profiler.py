@@ -0,0 +1,341 @@
+import csv
+import functools
+import math
+import sys
+import time
+from collections import defaultdict, deque
+
+import bpy
+from bpy.props import BoolProperty, StringProperty
+
+# Módulos del paquete cuyos operadores se instrumentan
+PROFILED_MODULES = ("diamant_jewelry", "gem_distribution", "export_stl")
+
+# Cantidad de ejecuciones que se guardan (las más viejas se descartan)
+RING_SIZE = 2000
+
+_records = deque(maxlen=RING_SIZE)
+_current = None  # registro de la ejecución en curso
+_wrapped = []    # clases instrumentadas
+
+
+# ------------------------------
+# API para los operadores
+# ------------------------------
+# Los módulos del paquete importan phase() y count() siempre; mientras el
+# perfilado está apagado no miden nada, así que no hace falta otro respaldo.
+
+class _NullPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    __slots__ = ("record", "name", "start")
+
+    def __init__(self, record, name):
+        self.record = record
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.record["phases"][self.name] += time.perf_counter() - self.start
+        return False
+
+
+def phase(name):
+    """Context manager que acumula el tiempo de una fase (no hace nada si el perfilado está apagado)."""
+    if _current is None:
+        return _NULL_PHASE
+    return _Phase(_current, name)
+
+
+def count(name, n=1):
+    """Suma `n` al contador `name` de la ejecución en curso."""
+    if _current is not None:
+        _current["counts"][name] += n
+
+
+# ------------------------------
+# Instrumentación
+# ------------------------------
+
+def _new_record(cls):
+    return {
+        "operator": cls.__name__,
+        "time": time.time(),
+        "phases": defaultdict(float),
+        "counts": defaultdict(int),
+    }
+
+
+def _run(record, method, *args):
+    """Llama a `method` con `record` como ejecución en curso."""
+    global _current
+    previous, _current = _current, record
+    try:
+        return method(*args)
+    finally:
+        _current = previous
+
+
+def _wrap_execute(cls):
+    original = cls.execute
+
+    @functools.wraps(original)
+    def execute(self, context):
+        record = _new_record(cls)
+        start = time.perf_counter()
+        try:
+            return _run(record, original, self, context)
+        finally:
+            record["total"] = time.perf_counter() - start
+            _records.append(record)
+
+    execute._jt_original = original
+    cls.execute = execute
+
+
+def _wrap_modal(cls):
+    """
+    Operadores modales: el registro empieza en `invoke`, cada llamada a `modal`
+    suma sus fases al mismo registro y se guarda al terminar (el total es el
+    tiempo de reloj de toda la tarea).
+    """
+    original_invoke, original_modal = cls.invoke, cls.modal
+
+    def finish(record):
+        record["total"] = time.perf_counter() - record.pop("start")
+        _records.append(record)
+
+    @functools.wraps(original_invoke)
+    def invoke(self, context, event):
+        record = _new_record(cls)
+        record["start"] = time.perf_counter()
+        result = _run(record, original_invoke, self, context, event)
+        if 'RUNNING_MODAL' in result:
+            self._jt_record = record
+        else:
+            finish(record)
+        return result
+
+    @functools.wraps(original_modal)
+    def modal(self, context, event):
+        record = getattr(self, "_jt_record", None)
+        if record is None:
+            return original_modal(self, context, event)
+        result = _run(record, original_modal, self, context, event)
+        if 'RUNNING_MODAL' not in result and 'PASS_THROUGH' not in result:
+            self._jt_record = None
+            finish(record)
+        return result
+
+    invoke._jt_original = original_invoke
+    modal._jt_original = original_modal
+    cls.invoke = invoke
+    cls.modal = modal
+
+
+def _operator_classes():
+    for name in PROFILED_MODULES:
+        module = sys.modules.get(f"{__package__}.{name}")
+        if module is None:
+            continue
+        for value in vars(module).values():
+            if (
+                isinstance(value, type)
+                and issubclass(value, bpy.types.Operator)
+                and value.__module__ == module.__name__
+                and "execute" in vars(value)
+            ):
+                yield value
+
+
+def instrument():
+    """Envuelve `execute` (e `invoke`/`modal` de los modales) de los operadores de los módulos perfilados."""
+    for cls in _operator_classes():
+        if hasattr(cls.execute, "_jt_original"):
+            continue
+        _wrap_execute(cls)
+        if "modal" in vars(cls) and "invoke" in vars(cls):
+            _wrap_modal(cls)
+        _wrapped.append(cls)
+
+
+def uninstrument():
+    """Restaura los métodos originales."""
+    while _wrapped:
+        cls = _wrapped.pop()
+        for name in ("execute", "invoke", "modal"):
+            method = vars(cls).get(name)
+            if hasattr(method, "_jt_original"):
+                setattr(cls, name, method._jt_original)
+
+
+def _update_enabled(self, context):
+    if self.jt_profiling:
+        instrument()
+    else:
+        uninstrument()
+
+
+# ------------------------------
+# Estadísticas
+# ------------------------------
+
+def _percentile(values, q):
+    """Percentil por el método del rango más cercano."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100.0 * len(ordered)) - 1)]
+
+
+def summary():
+    """Resumen por operador: llamadas, p50/p95 del total y de cada fase, y contadores medios."""
+    grouped = defaultdict(list)
+    for record in _records:
+        grouped[record["operator"]].append(record)
+
+    rows = []
+    for operator, records in sorted(grouped.items()):
+        totals = [r["total"] for r in records]
+        row = {
+            "operator": operator,
+            "calls": len(records),
+            "p50_ms": _percentile(totals, 50) * 1000.0,
+            "p95_ms": _percentile(totals, 95) * 1000.0,
+        }
+        phases = {name for r in records for name in r["phases"]}
+        for name in sorted(phases):
+            values = [r["phases"].get(name, 0.0) for r in records]
+            row[f"{name}_p50_ms"] = _percentile(values, 50) * 1000.0
+            row[f"{name}_p95_ms"] = _percentile(values, 95) * 1000.0
+        counters = {name for r in records for name in r["counts"]}
+        for name in sorted(counters):
+            row[f"{name}_mean"] = sum(r["counts"].get(name, 0) for r in records) / len(records)
+        rows.append(row)
+    return rows
+
+
+# ------------------------------
+# Operadores
+# ------------------------------
+
+class JTPROFILE_OT_dump_csv(bpy.types.Operator):
+    """Guarda el resumen p50/p95 por operador en un CSV"""
+    bl_idname = "jtprofile.dump_csv"
+    bl_label = "Guardar CSV"
+
+    filepath: StringProperty(subtype="FILE_PATH", default="jewelry_profile.csv")
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        rows = summary()
+        if not rows:
+            self.report({'WARNING'}, "No hay mediciones.")
+            return {'CANCELLED'}
+
+        fieldnames = ["operator", "calls", "p50_ms", "p95_ms"]
+        for row in rows:
+            fieldnames.extend(k for k in row if k not in fieldnames)
+
+        filepath = bpy.path.abspath(self.filepath)
+        with open(filepath, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(rows)
+
+        self.report({'INFO'}, f"Perfil guardado en {filepath}")
+        return {'FINISHED'}
+
+
+class JTPROFILE_OT_clear(bpy.types.Operator):
+    """Borra las mediciones guardadas"""
+    bl_idname = "jtprofile.clear"
+    bl_label = "Limpiar"
+
+    def execute(self, context):
+        _records.clear()
+        return {'FINISHED'}
+
+
+# ------------------------------
+# Panel en N
+# ------------------------------
+
+class VIEW3D_PT_jewelry_profiler(bpy.types.Panel):
+    bl_label = "Perfilado"
+    bl_idname = "VIEW3D_PT_jewelry_profiler"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = 'Jewelry Tools'
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        wm = context.window_manager
+        layout.prop(wm, "jt_profiling", text="Medir operadores", icon="TIME", toggle=True)
+
+        col = layout.column(align=True)
+        for row in summary():
+            col.label(text=f"{row['operator']}  ×{row['calls']}")
+            col.label(text=f"    p50 {row['p50_ms']:.1f} ms · p95 {row['p95_ms']:.1f} ms")
+            for key, value in row.items():
+                if key.endswith("_p50_ms") and key != "p50_ms":
+                    p95 = row[f"{key[:-7]}_p95_ms"]
+                    col.label(text=f"    {key[:-7]}: p50 {value:.1f} · p95 {p95:.1f} ms")
+                elif key.endswith("_mean"):
+                    col.label(text=f"    {key[:-5]}: {value:.0f}")
+
+        cache = sys.modules.get(f"{__package__}.jewelry_cache")
+        if cache is not None:
+            stats = cache.stats()
+            col = layout.column(align=True)
+            col.label(text=f"Cache: {stats['hits']} aciertos · {stats['misses']} fallos ({stats['hit_rate']:.0%})")
+            col.label(text=f"    {stats['entries']} entradas · {stats['bytes'] / 1048576:.1f} MB · {stats['evictions']} descartes")
+
+        row = layout.row(align=True)
+        row.operator("jtprofile.dump_csv", icon="FILE_TEXT")
+        row.operator("jtprofile.clear", icon="TRASH")
+
+
+# ------------------------------
+# Registro
+# ------------------------------
+
+classes = (
+    JTPROFILE_OT_dump_csv,
+    JTPROFILE_OT_clear,
+    VIEW3D_PT_jewelry_profiler,
+)
+
+
+def register():
+    for cls in classes:
+        bpy.utils.register_class(cls)
+    bpy.types.WindowManager.jt_profiling = BoolProperty(
+        name="Perfilado",
+        description="Mide fases y contadores de cada operador de Jewelry Tools",
+        default=False,
+        update=_update_enabled,
+    )
+
+
+def unregister():
+    uninstrument()
+    del bpy.types.WindowManager.jt_profiling
+    for cls in reversed(classes):
+        bpy.utils.unregister_class(cls)
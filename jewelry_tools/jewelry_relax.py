@@ -0,0 +1,215 @@
+"""
+Relajación de distribuciones de gemas con NumPy (sin bpy).
+
+Está separado de gem_distribution para que los procesos del modo paralelo
+lo puedan importar sin Blender (el __init__ del paquete no importa bpy).
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context, shared_memory
+
+import numpy as np
+
+# Pares más lejanos que esto (en múltiplos de su distancia objetivo) no se relajan
+FACTOR_VECINOS = 1.5
+
+# Por debajo de esta cantidad de gemas nunca se arrancan procesos (cuesta más de lo
+# que ahorra). No está medido para cada máquina: por eso el modo paralelo viene
+# apagado y conviene compararlo con benchmark_jewelry.py antes de activarlo
+UMBRAL_PARALELO = 2000
+
+# Tiles por proceso (más tiles reparten mejor la carga en distribuciones irregulares)
+TILES_POR_PROCESO = 4
+
+
+def distancias_por_par(distancias, i, j):
+    """Distancia objetivo de cada par (i, j): promedio de la de cada gema (tamaños mezclados)."""
+    return (distancias[i] + distancias[j]) / 2
+
+
+def pares_en_rejilla(celdas):
+    """
+    Pares candidatos (i, j), i < j, de puntos cuyas celdas enteras (N, D) son
+    vecinas: cada punto solo se compara con las 3**D celdas a su alrededor.
+    Sirve para 2D y 3D; el filtro fino (distancia, cajas) lo hace quien llama.
+    """
+    celdas = celdas - (celdas.min(axis=0) - 1)
+    dims = celdas.max(axis=0) + 2
+    pasos = np.ones(celdas.shape[1], dtype=np.int64)
+    pasos[:-1] = np.cumprod(dims[:0:-1])[::-1]
+    claves = celdas @ pasos
+    orden = np.argsort(claves, kind="stable")
+    ordenadas = claves[orden]
+
+    lista_i, lista_j = [], []
+    indices = np.arange(len(claves))
+    for desplazamiento in np.ndindex(*(3,) * celdas.shape[1]):
+        buscadas = claves + (np.array(desplazamiento) - 1) @ pasos
+        inicio = np.searchsorted(ordenadas, buscadas, side="left")
+        cuantos = np.searchsorted(ordenadas, buscadas, side="right") - inicio
+        total = cuantos.sum()
+        if not total:
+            continue
+        i = np.repeat(indices, cuantos)
+        desplaz = np.arange(total) - np.repeat(np.cumsum(cuantos) - cuantos, cuantos)
+        j = orden[np.repeat(inicio, cuantos) + desplaz]
+        mantener = i < j
+        lista_i.append(i[mantener])
+        lista_j.append(j[mantener])
+
+    if not lista_i:
+        vacio = np.empty(0, dtype=np.int64)
+        return vacio, vacio
+    return np.concatenate(lista_i), np.concatenate(lista_j)
+
+
+def pares_vecinos(pos, radio):
+    """Pares (i, j), i < j, de puntos 2D a menos de `radio`."""
+    i, j = pares_en_rejilla(np.floor(pos / radio).astype(np.int64))
+    cerca = ((pos[j] - pos[i]) ** 2).sum(axis=1) < radio * radio
+    return i[cerca], j[cerca]
+
+
+def paso_relajacion(pos, distancias, radio):
+    """
+    Una iteración: desplazamiento (N, 2) de cada gema hacia la distancia
+    objetivo de sus vecinas, promediado por gema. Todo sale de las
+    posiciones actuales, así que el resultado no depende del orden.
+    """
+    desplazamiento = np.zeros_like(pos)
+    if len(pos) < 2:
+        return desplazamiento
+    i, j = pares_vecinos(pos, radio)
+    objetivo = distancias_por_par(distancias, i, j)
+    d = pos[j] - pos[i]
+    dist = np.sqrt((d * d).sum(axis=1))
+    diff = dist - objetivo
+
+    # Solo vecinos reales, sin división por cero y con tolerancia para que no tiemblen
+    activos = (dist > 1e-6) & (dist < objetivo * FACTOR_VECINOS) & (np.abs(diff) > 1e-4)
+    if not activos.any():
+        return desplazamiento
+    i, j, d, dist, diff = i[activos], j[activos], d[activos], dist[activos], diff[activos]
+
+    # mover ambos objetos mitad y mitad
+    mover = d / dist[:, None] * (diff / 2)[:, None]
+    np.add.at(desplazamiento, i, mover)
+    np.add.at(desplazamiento, j, -mover)
+    veces = np.bincount(np.concatenate((i, j)), minlength=len(pos))
+    return desplazamiento / np.maximum(veces, 1)[:, None]
+
+
+def relajar(pos, distancias, iteraciones):
+    """
+    Acerca o separa cada par de gemas vecinas hacia su distancia objetivo.
+    `pos` es (N, 2) y se modifica en sitio.
+    """
+    radio = distancias.max() * FACTOR_VECINOS
+    for _ in range(iteraciones):
+        desplazamiento = paso_relajacion(pos, distancias, radio)
+        if not desplazamiento.any():
+            break
+        pos += desplazamiento
+    return pos
+
+
+# ------------------------------
+# Modo paralelo (tiles con halo)
+# ------------------------------
+
+# Buffers compartidos abiertos en cada proceso hijo: clave -> (SharedMemory, array)
+_compartido = {}
+
+
+def _adjuntar(buffers):
+    """Inicializador de los procesos: abre los buffers de memoria compartida."""
+    for clave, (nombre, forma) in buffers.items():
+        shm = shared_memory.SharedMemory(name=nombre)
+        _compartido[clave] = (shm, np.ndarray(forma, dtype=np.float64, buffer=shm.buf))
+
+
+def _relajar_tile(tarea):
+    """
+    Relaja las gemas del núcleo de un tile leyendo también las del halo.
+    Lee un buffer de posiciones y escribe solo las filas de su núcleo en el
+    otro, así los tiles nunca se pisan entre sí.
+    """
+    lectura, escritura, lo, hi, halo, radio = tarea
+    pos = _compartido[lectura][1]
+    distancias = _compartido["distancias"][1]
+    salida = _compartido[escritura][1]
+
+    zona = np.flatnonzero(np.all((pos >= lo - halo) & (pos < hi + halo), axis=1))
+    sub = pos[zona]
+    nucleo = np.all((sub >= lo) & (sub < hi), axis=1)
+    desplazamiento = paso_relajacion(sub, distancias[zona], radio)[nucleo]
+    salida[zona[nucleo]] = sub[nucleo] + desplazamiento
+    return bool(desplazamiento.any())
+
+
+def _tiles(pos, lado):
+    """Rejilla de tiles (lo, hi) que cubre todo el plano (los bordes exteriores son infinitos)."""
+    minimo, maximo = pos.min(axis=0), pos.max(axis=0)
+    cuantos = np.maximum(np.ceil((maximo - minimo) / lado).astype(int), 1)
+    cortes = []
+    for eje in range(2):
+        bordes = minimo[eje] + lado * np.arange(cuantos[eje] + 1, dtype=np.float64)
+        bordes[0], bordes[-1] = -np.inf, np.inf
+        cortes.append(bordes)
+    return [
+        (np.array([cortes[0][a], cortes[1][b]]), np.array([cortes[0][a + 1], cortes[1][b + 1]]))
+        for a in range(cuantos[0])
+        for b in range(cuantos[1])
+    ]
+
+
+def relajar_en_paralelo(pos, distancias, iteraciones, procesos=None):
+    """
+    Igual que `relajar`, repartiendo cada iteración en tiles entre procesos.
+    Cada tile lee las posiciones de la iteración anterior (núcleo + halo de un
+    radio de vecindad) y escribe su núcleo; al terminar todos se intercambian
+    los buffers, que es donde se reconcilian los bordes. La división en tiles
+    solo depende de las posiciones, así que el resultado es determinista.
+    `pos` es (N, 2) y se modifica en sitio.
+    """
+    procesos = procesos or os.cpu_count() or 1
+    if procesos < 2 or len(pos) < UMBRAL_PARALELO:
+        return relajar(pos, distancias, iteraciones)
+
+    radio = distancias.max() * FACTOR_VECINOS
+    extension = np.ptp(pos, axis=0)
+    area = max(float(extension[0] * extension[1]), radio * radio)
+    lado = max(np.sqrt(area / (procesos * TILES_POR_PROCESO)), 4.0 * radio)
+    tiles = _tiles(pos, lado)
+
+    memorias = {}
+    try:
+        for clave, datos in (("a", pos), ("b", pos), ("distancias", distancias)):
+            datos = np.ascontiguousarray(datos, dtype=np.float64)
+            shm = shared_memory.SharedMemory(create=True, size=max(datos.nbytes, 1))
+            np.ndarray(datos.shape, dtype=np.float64, buffer=shm.buf)[...] = datos
+            memorias[clave] = (shm, datos.shape)
+        buffers = {clave: (shm.name, forma) for clave, (shm, forma) in memorias.items()}
+
+        lectura, escritura = "a", "b"
+        with ProcessPoolExecutor(
+            max_workers=min(procesos, len(tiles)),
+            mp_context=get_context("spawn"),
+            initializer=_adjuntar,
+            initargs=(buffers,),
+        ) as pool:
+            for _ in range(iteraciones):
+                tareas = [(lectura, escritura, lo, hi, radio, radio) for lo, hi in tiles]
+                movidos = list(pool.map(_relajar_tile, tareas))
+                lectura, escritura = escritura, lectura
+                if not any(movidos):
+                    break
+
+        shm, forma = memorias[lectura]
+        pos[...] = np.ndarray(forma, dtype=np.float64, buffer=shm.buf)
+    finally:
+        for shm, _ in memorias.values():
+            shm.close()
+            shm.unlink()
+    return pos